@@ -18,7 +18,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(_HERE, os.pardir)))
 
 import hienoi
 import hienoi.application
-from hienoi import Vector2f, Vector2i, Vector4f
+from hienoi import Vector2f, Vector2i, Vector4ub
 from hienoi.application import Callback
 
 
@@ -139,11 +139,11 @@ def update_particle_simulation(sim):
     for particle in sim.particles:
         # If the particle recently collided, it must have been colored red.
         # We want to progressively restore its color back to white.
-        particle.color = Vector4f(
-            min(particle.color.r + 0.05, 1.0),
-            min(particle.color.g + 0.05, 1.0),
-            min(particle.color.b + 0.05, 1.0),
-            1.0,
+        particle.color = Vector4ub(
+            min(int(particle.color.r) + 13, 255),
+            min(int(particle.color.g) + 13, 255),
+            min(int(particle.color.b) + 13, 255),
+            255,
         )
 
         # Bounce the particle if it went beyond the canvas' bounds.
@@ -181,7 +181,7 @@ def update_particle_simulation(sim):
             ):
                 continue
 
-            particle.color = Vector4f(1.0, 0.0, 0.0, 1.0)
+            particle.color = Vector4ub(255, 0, 0, 255)
 
             dir = neighbour.particle.position - particle.position
             dir.inormalize()
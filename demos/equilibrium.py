@@ -25,7 +25,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(_HERE, os.pardir)))
 
 import hienoi
 import hienoi.application
-from hienoi import Vector2f, Vector4f
+from hienoi import Vector2f, Vector4ub
 from hienoi.application import Callback
 from hienoi.gui import NavigationAction
 
@@ -156,10 +156,8 @@ def update_particle_simulation(sim):
             particle.force += force
 
         # Color the particle according to how near it is to any other particle.
-        particle.color = Vector4f(1.0,
-                                  1.0 - highest_proximity,
-                                  1.0 - highest_proximity,
-                                  1.0)
+        shade = int(255 * (1.0 - highest_proximity))
+        particle.color = Vector4ub(255, shade, shade, 255)
 
 
 def run():
@@ -95,9 +95,12 @@ def update_particle_simulation(sim):
                       * data['mass'][:, numpy.newaxis]
                       / squared_distances)
 
-    data['color'] = (_FAR_COLOR - _NEAR_COLOR)
-    data['color'] *= squared_distances / _FAR_SQUARED_DISTANCE
-    data['color'] += _NEAR_COLOR
+    # The colors are blended in floating-point and then stored as unsigned
+    # bytes.
+    near_color = numpy.asarray(_NEAR_COLOR)
+    far_color = numpy.asarray(_FAR_COLOR)
+    blend = numpy.minimum(squared_distances / _FAR_SQUARED_DISTANCE, 1.0)
+    data['color'] = 255.0 * (near_color + (far_color - near_color) * blend)
 
 
 def run():
@@ -82,7 +82,8 @@ def _get_particle_color(velocity, normalized_age):
     speed = min(1.0, velocity.length() / _FAST_VELOCITY)
     color = Vector4f.lerp(_SLOW_COLOR, _FAST_COLOR, speed)
     color.iscale(_remap_clamped(normalized_age, 0.0, 1.0, 1.0, 0.5))
-    return color
+    # Particle colors are stored as unsigned bytes.
+    return color.iscale(255.0)
 
 
 def _set_emitter_position(sim, position):
@@ -3,8 +3,8 @@
 import collections
 
 import hienoi._nani
-from hienoi._numeric import Float32
-from hienoi._vectors import VECTOR2F, COLOR4F
+from hienoi._numeric import Float16
+from hienoi._vectors import VECTOR2F, COLOR4UB
 
 
 class ParticleDisplay(object):
@@ -59,11 +59,25 @@ _Attribute = collections.namedtuple(
         'nani',
         'element_type',
         'count',
+        'normalized',
     ))
 
 
 class Attribute(_Attribute):
-    """Attribute."""
+    """Attribute.
+
+    Attributes
+    ----------
+    nani : nani data type
+        Nani type.
+    element_type : hienoi numerical type
+        Type of each element.
+    count : int
+        Number of elements.
+    normalized : bool
+        ``True`` if integer values are to be mapped to the range [0.0, 1.0]
+        when read by the renderer.
+    """
 
     __slots__ = ()
 
@@ -72,15 +86,18 @@ PARTICLE_ATTRS = ParticleAttributes(
     position=Attribute(
         nani=VECTOR2F,
         element_type=VECTOR2F.element_type.type,
-        count=2),
+        count=2,
+        normalized=False),
     size=Attribute(
-        nani=hienoi._nani.Number(type=Float32, default=1.0),
-        element_type=Float32,
-        count=1),
+        nani=hienoi._nani.Number(type=Float16, default=1.0),
+        element_type=Float16,
+        count=1,
+        normalized=False),
     color=Attribute(
-        nani=COLOR4F,
-        element_type=COLOR4F.element_type.type,
-        count=4))
+        nani=COLOR4UB,
+        element_type=COLOR4UB.element_type.type,
+        count=4,
+        normalized=True))
 
 PARTICLE_NANI = hienoi._nani.resolve(
     hienoi._nani.Structure(
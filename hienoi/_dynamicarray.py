@@ -1,13 +1,24 @@
 """Dynamic array based on NumPy."""
 
 import math
+import sys
 
 import numpy
 
 
+if sys.version_info[0] == 2:
+    _range = xrange
+else:
+    _range = range
+
+
 _GROW_FACTOR = 1.5
 assert _GROW_FACTOR > 1.0
 
+# Smallest capacity allocated when growing, so that the grow factor
+# effectively increases the capacity of small arrays.
+_MIN_CAPACITY = int(math.ceil(1.0 / (_GROW_FACTOR - 1.0)) * 2)
+
 
 class DynamicArray(object):
     """Dynamic array based on NumPy.
@@ -22,18 +33,31 @@ class DynamicArray(object):
         this = DynamicArray(0, dtype)
         this._array = numpy.frombuffer(buf, dtype)
         this._size = len(this._array)
+        this._data = None
         return this
 
     def __init__(self, capacity, dtype):
         self._array = numpy.empty(capacity, dtype=dtype)
         self._size = 0
 
+        # View over the data, cached until either the storage or the size
+        # change.
+        self._data = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_data'] = None
+        return state
+
     def __len__(self):
         return self._size
 
     @property
     def data(self):
-        return self._array[:self._size]
+        if self._data is None:
+            self._data = self._array[:self._size]
+
+        return self._data
 
     @property
     def capacity(self):
@@ -43,23 +67,43 @@ class DynamicArray(object):
     def dtype(self):
         return self._array.dtype
 
+    def equals(self, other):
+        """Check if the data is equal to a sequence of elements."""
+        other = numpy.asarray(other, dtype=self._array.dtype)
+        return numpy.array_equal(self.data, other)
+
     def copy_from(self, data):
         """Replace the data with a copy of some other data."""
         size = len(data)
         self.grow(size, copy=False)
-        for field in self._array.dtype.fields:
-            self._array[field][:size] = data[field]
+        if data.dtype == self._array.dtype:
+            # Same memory layout, copy the elements as a whole.
+            self._array[:size] = data
+        else:
+            for field in self._array.dtype.fields:
+                self._array[field][:size] = data[field]
 
         self._size = size
+        self._data = None
 
     def grow(self, requested, copy=True):
         """Increase the storage's capacity if needed."""
         if requested <= len(self._array):
             return
 
-        capacity = max(requested,
-                       int(max(len(self._array) * _GROW_FACTOR,
-                               math.ceil(1.0 / (_GROW_FACTOR - 1.0)) * 2)))
+        capacity = max(requested, _MIN_CAPACITY,
+                       int(len(self._array) * _GROW_FACTOR))
+        self._data = None
+        if copy and self._array.flags.owndata:
+            try:
+                # Let the allocator extend the storage in place if it can.
+                # This is refused when any other array still references the
+                # storage, in which case it must be left untouched.
+                self._array.resize(capacity)
+                return
+            except ValueError:
+                pass
+
         array = numpy.empty(capacity, dtype=self._array.dtype)
         if copy:
             array[:self._size] = self._array[:self._size]
@@ -67,11 +111,13 @@ class DynamicArray(object):
             self._size = 0
 
         self._array = array
+        self._data = None
 
     def resize(self, requested, copy=True):
         """Change the size of the array."""
         self.grow(requested, copy=copy)
         self._size = requested
+        self._data = None
 
     def append(self, data):
         """Append a new element."""
@@ -80,17 +126,43 @@ class DynamicArray(object):
         self._array[self._size] = data
         out = self._array[self._size]
         self._size = new_size
+        self._data = None
         return out
 
     def extend(self, data):
         """Append multiple elements."""
+        is_iterator = not hasattr(data, '__len__')
+        if ((is_iterator or isinstance(data, _range))
+                and self._array.dtype.fields is None
+                and self._array.dtype.subdtype is None):
+            # Convert the scalar elements with a typed loop, without
+            # creating any intermediate list.
+            data = numpy.fromiter(data, dtype=self._array.dtype,
+                                  count=-1 if is_iterator else len(data))
+        elif is_iterator:
+            # Iterators of unknown length are gathered first so that the
+            # storage grows only once and that the elements are copied with
+            # a single slice assignment.
+            data = list(data)
+
         new_size = self._size + len(data)
         self.grow(new_size)
         self._array[self._size:new_size] = data
         out = self._array[self._size:new_size]
         self._size = new_size
+        self._data = None
+        return out
+
+    def emplace(self, count):
+        """Append multiple uninitialized elements to be filled in-place."""
+        new_size = self._size + count
+        self.grow(new_size)
+        out = self._array[self._size:new_size]
+        self._size = new_size
+        self._data = None
         return out
 
     def clear(self):
         """Clear the data."""
         self._size = 0
+        self._data = None
@@ -30,14 +30,20 @@ _npmax = numpy.maximum
 
 _INITIAL_NEIGHBOURS_CAPACITY = 32
 
+# Number of points up to which a brute-force search outperforms traversing
+# the tree.
+_BRUTE_FORCE_THRESHOLD = 512
+
 
 class KDTree(object):
     """K-d tree.
 
-    Nodes are stored contiguously in memory.
+    Nodes are stored contiguously in memory. For small data sets, the tree
+    isn't built and the searches are done by brute force instead.
     """
 
-    def __init__(self, data, bucket_size=128):
+    def __init__(self, data, bucket_size=128,
+                 brute_force_threshold=_BRUTE_FORCE_THRESHOLD):
         if bucket_size < 1:
             raise ValueError("A minimum bucket size of 1 is expected.")
 
@@ -58,7 +64,8 @@ class KDTree(object):
             ('index', numpy.intp),
         ])
 
-        self._build()
+        if self._n > brute_force_threshold:
+            self._build()
 
     def search(self, point, count, radius, sort):
         """Retrieve the neighbours to a point."""
@@ -73,7 +80,9 @@ class KDTree(object):
             return numpy.empty(0, dtype=self._neighbour_dtype)
 
         point = numpy.asarray(point, dtype=numpy.float_)
-        if count >= self._n:
+        if self._nodes is None:
+            return self._search_brute_force(point, count, radius, sort)
+        elif count >= self._n:
             return self._search_all_within_radius(point, radius, sort)
         else:
             return self._search_k_nearests(point, count, radius, sort)
@@ -105,11 +114,9 @@ class KDTree(object):
                 split_axis = numpy.argmax(side_lengths)
                 split_location = (lower_bounds[split_axis]
                                   + upper_bounds[split_axis]) / 2.0
-                axis_data = points[:, split_axis]
-                left_indices = indices[
-                    numpy.nonzero(axis_data <= split_location)[0]]
-                right_indices = indices[
-                    numpy.nonzero(axis_data > split_location)[0]]
+                is_left = points[:, split_axis] <= split_location
+                left_indices = indices[is_left]
+                right_indices = indices[~is_left]
                 stack.appendleft((right_indices, i))
                 stack.appendleft((left_indices, i))
 
@@ -127,6 +134,28 @@ class KDTree(object):
         for i in reversed(_range(1, len(self._nodes))):
             node_sizes[parents[i]] += node_sizes[i]
 
+    def _search_brute_force(self, point, count, radius, sort):
+        """Search the nearest points by computing all the distances."""
+        dists = numpy.sum((point[numpy.newaxis, :] - self._data) ** 2,
+                          axis=-1)
+
+        # Follow the same radius inclusivity as the tree searches.
+        if count >= self._n:
+            indices = numpy.nonzero(dists <= radius ** 2)[0]
+        else:
+            indices = numpy.nonzero(dists < radius ** 2)[0]
+            if count < len(indices):
+                indices = indices[
+                    numpy.argpartition(dists[indices], count - 1)[:count]]
+
+        out = numpy.empty(len(indices), dtype=self._neighbour_dtype)
+        out['squared_distance'] = dists[indices]
+        out['index'] = indices
+        if sort:
+            out.sort(order='squared_distance')
+
+        return out
+
     def _search_k_nearests(self, point, count, radius, sort):
         """Search the nearest points within a radius."""
         data = self._data
@@ -158,7 +187,11 @@ class KDTree(object):
                 points = data[indices]
                 dists = numpy.sum(
                     (point[numpy.newaxis, :] - points) ** 2, axis=-1)
-                for j, dist in _zip(indices, dists):
+
+                # Only iterate in Python over the points that are currently
+                # within the distance limit.
+                candidates = numpy.nonzero(dists < dist_limit)[0]
+                for j, dist in _zip(indices[candidates], dists[candidates]):
                     if dist < dist_limit:
                         if len(nearests) >= count:
                             dist_limit = -_heappushpop(nearests, (-dist, j))[0]
@@ -1,7 +1,7 @@
 """Glue for numeric data types from different modules."""
 
-__all__ = ['Int8', 'UInt8', 'Int16', 'UInt16', 'Int32', 'UInt32', 'Float32',
-           'Float64']
+__all__ = ['Int8', 'UInt8', 'Int16', 'UInt16', 'Int32', 'UInt32', 'Float16',
+           'Float32', 'Float64']
 
 import ctypes
 
@@ -45,6 +45,15 @@ class UInt32(object):
     pass
 
 
+class Float16(object):
+    """16-bit floating-point type.
+
+    There is no ctypes equivalent for this type.
+    """
+
+    pass
+
+
 class Float32(object):
     """32-bit floating-point type."""
 
@@ -100,6 +109,13 @@ _TYPES_DATA = {
         'gl': gl.GL_UNSIGNED_INT,
         'numpy': numpy.uint32,
     },
+    Float16: {
+        'size': 2,
+        'literal': 'h',
+        'ctype': None,
+        'gl': gl.GL_HALF_FLOAT,
+        'numpy': numpy.float16,
+    },
     Float32: {
         'size': 4,
         'literal': 'f',
@@ -119,7 +135,8 @@ _TYPES_DATA = {
 _TYPES = tuple(_TYPES_DATA.keys())
 
 _CTYPE_TO_THIS = {_TYPES_DATA[this_type]['ctype']: this_type
-                  for this_type in _TYPES}
+                  for this_type in _TYPES
+                  if _TYPES_DATA[this_type]['ctype'] is not None}
 
 _GL_TO_THIS = {_TYPES_DATA[this_type]['gl']: this_type
                for this_type in _TYPES}
@@ -15,6 +15,10 @@ else:
     _zip = zip
 
 
+# Maximum number of bunch arrays kept around for reuse after clearing.
+_BUNCH_POOL_CAPACITY = 8
+
+
 _Bunch = collections.namedtuple(
     '_Bunch', (
         'position',
@@ -37,12 +41,18 @@ class OrderedBuffer(object):
         self._buckets = []
         self._bucket_capacity = bucket_capacity
         self._pos = [0, 0]
+        self._size = 0
 
         self._bunchs = []
 
+        # Bunch arrays allocated by the buffer itself, as opposed to the ones
+        # passed by the caller, and the ones available for reuse, per size.
+        self._allocated_bunchs = []
+        self._bunch_pool = {}
+        self._bunch_pool_size = 0
+
     def __len__(self):
-        return (self._bucket_capacity * self._pos[0] + self._pos[1]
-                + sum(len(bunch.data) for bunch in self._bunchs))
+        return self._size
 
     @property
     def chunks(self):
@@ -86,26 +96,89 @@ class OrderedBuffer(object):
 
         return self._push(numpy.asarray(data, dtype=self._dtype), size)
 
+    def emplace(self, count):
+        """Append a bunch of uninitialized elements to be filled in-place."""
+        if count < 1:
+            return numpy.empty(0, dtype=self._dtype)
+
+        return self._push(None, count)
+
+    def concatenate(self, out=None):
+        """Gather all the elements into a single contiguous array."""
+        chunks = self.chunks
+        if not chunks:
+            if out is None:
+                out = numpy.empty(0, dtype=self._dtype)
+
+            return out
+
+        return numpy.concatenate(chunks, out=out)
+
     def clear(self):
         """Clear the data."""
         self._pos = [0, 0]
+        self._size = 0
         self._bunchs = []
 
+        for data in self._allocated_bunchs:
+            if self._bunch_pool_size >= _BUNCH_POOL_CAPACITY:
+                break
+
+            self._bunch_pool.setdefault(len(data), []).append(data)
+            self._bunch_pool_size += 1
+
+        self._allocated_bunchs = []
+
+    def _allocate_buckets(self):
+        """Allocate new buckets.
+
+        The buckets are carved out of a single allocation whose size grows
+        with the number of buckets already allocated. Previous allocations
+        are left untouched to not invalidate any element.
+        """
+        count = max(1, len(self._buckets) // 2)
+        capacity = self._bucket_capacity
+        slab = numpy.empty(count * capacity, dtype=self._dtype)
+        self._buckets.extend(slab[i * capacity:(i + 1) * capacity]
+                             for i in _range(count))
+
+    def _allocate_bunch(self, size):
+        """Allocate a new bunch, reusing a previous one if possible."""
+        pool = self._bunch_pool.get(size)
+        if pool:
+            data = pool.pop()
+            self._bunch_pool_size -= 1
+            if not pool:
+                del self._bunch_pool[size]
+        else:
+            data = numpy.empty(size, dtype=self._dtype)
+
+        self._allocated_bunchs.append(data)
+        return data
+
     def _push(self, data, size):
-        """Add new element(s) at the end."""
+        """Add new element(s) at the end.
+
+        The new elements are left uninitialized if the data is ``None``.
+        """
         i, j = self._pos
         if self._bucket_capacity - j >= size:
             if i == len(self._buckets):
-                self._buckets.append(
-                    numpy.empty(self._bucket_capacity, dtype=self._dtype))
+                self._allocate_buckets()
 
-            self._buckets[i][j:j + size] = data
             out = self._buckets[i][j:j + size]
+            if data is not None:
+                out[...] = data
 
-            j = (j + size) % self._bucket_capacity
-            self._pos = [i + 1 if j == 0 else i, j]
+            # Move on to the next bucket when this one is full.
+            step, j = divmod(j + size, self._bucket_capacity)
+            self._pos = [i + step, j]
         else:
+            if data is None:
+                data = self._allocate_bunch(size)
+
             self._bunchs.append(_Bunch(position=self._pos, data=data))
             out = data
 
+        self._size += size
         return out
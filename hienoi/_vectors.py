@@ -748,6 +748,10 @@ def _define_vectors(size):
     """Define a triplet of objects describing a vector."""
     out = {}
     for element_type in hienoi._numeric.get_types():
+        if hienoi._numeric.to_ctype(element_type) is None:
+            # Vectors are backed by ctypes arrays.
+            continue
+
         mixins = _VECTOR_MIXINS[type] = _VECTOR_MIXINS[element_type]
         literal = hienoi._numeric.get_type_literal(element_type)
         ctype_name = _CTYPE_PATTERN % (size, literal)
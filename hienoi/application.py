@@ -488,7 +488,7 @@ def _gui_process(to_psim, upwards, from_psim, downwards, sims, configs):
                 gui.render(current_state)
                 if capture and frame % capture_increment == 0:
                     filename = capture_filename.format(frame=frame)
-                    gui.write_snapshot(filename)
+                    gui.write_snapshot(filename, deferred=True)
 
                 frame += 1
                 render = False
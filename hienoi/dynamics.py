@@ -96,6 +96,10 @@ class ParticleSimulation(object):
     postsolve_callback : function
         Callback function executed after solving the simulation.
         It takes a single argument ``sim``, an instance of this class.
+    always_integrate : bool
+        By default, the integration of the forces into the velocities is
+        skipped whenever no particle has any force applied. Setting this to
+        ``True`` forces the integration to always run.
 
     Attributes
     ----------
@@ -120,13 +124,24 @@ class ParticleSimulation(object):
         ('velocity', VECTOR2F),
         ('force', VECTOR2F),
         ('mass', Number(type=Float32, default=1.0)),
-        ('size', hienoi._common.PARTICLE_ATTRS.size.nani),
+        # Kept in single precision for the simulation, the half precision
+        # being only used to send the particles to the renderer.
+        ('size', Number(type=Float32, default=1.0)),
         ('color', hienoi._common.PARTICLE_ATTRS.color.nani),
     )
     _ATTR_ID_NUMPY_TYPE = hienoi._numeric.to_numpy(_ATTRS[0][1].type)
 
     class Neighbours(object):
-        """Neighbour sequence."""
+        """Neighbour sequence.
+
+        Iterating over this sequence wraps each neighbour into a
+        :class:`ParticleSimulation.Neighbour` object. When only the indices or
+        the squared distances are required, the attributes :attr:`indices` and
+        :attr:`squared_distances` provide direct NumPy views to the data
+        instead, allowing for vectorized operations.
+        """
+
+        __slots__ = ('_neighbours', '_particles', '_particle_view')
 
         def __init__(self, neighbours, particles, particle_view):
             self._neighbours = neighbours
@@ -137,18 +152,30 @@ class ParticleSimulation(object):
             return len(self._neighbours)
 
         def __iter__(self):
-            return (
-                ParticleSimulation.Neighbour(
-                    item, self._particle_view(self._particles[item['index']]))
-                for item in self._neighbours)
+            neighbour = ParticleSimulation.Neighbour
+            particles = self._particles
+            particle_view = self._particle_view
+            return (neighbour(item, particle_view(particles[index]))
+                    for item, index in _zip(self._neighbours,
+                                           self._neighbours['index']))
 
         @property
         def data(self):
             return self._neighbours
 
+        @property
+        def indices(self):
+            return self._neighbours['index']
+
+        @property
+        def squared_distances(self):
+            return self._neighbours['squared_distance']
+
     class Neighbour(object):
         """Neighbour object."""
 
+        __slots__ = ('_data', '_particle')
+
         def __init__(self, data, particle):
             self._data = data
             self._particle = particle
@@ -172,7 +199,8 @@ class ParticleSimulation(object):
                  particle_attributes=None,
                  initialize_callback=None,
                  presolve_callback=None,
-                 postsolve_callback=None):
+                 postsolve_callback=None,
+                 always_integrate=False):
         attrs = self._ATTRS
         if particle_attributes is not None:
             attrs += particle_attributes
@@ -183,6 +211,7 @@ class ParticleSimulation(object):
         self._postsolve_callback = postsolve_callback
 
         self._time_step = time_step
+        self._always_integrate = always_integrate
         self._time = 0.0
         self._last_id = -1
 
@@ -205,6 +234,10 @@ class ParticleSimulation(object):
     def time_step(self):
         return self._time_step
 
+    @time_step.setter
+    def time_step(self, value):
+        self._time_step = value
+
     @property
     def time(self):
         return self._time
@@ -252,12 +285,13 @@ class ParticleSimulation(object):
         sequence of nani.Particle
             The new particles.
         """
-        array = numpy.empty(count, dtype=self._nani.dtype)
-        array[:] = self._nani.default
-        array['id'] = numpy.arange(self._last_id + 1,
-                                   self._last_id + 1 + count)
-        particles = self._buffer.extend(array)
-        self._last_id = particles['id'][-1]
+        # The particles are initialized in-place, directly into the buffer.
+        particles = self._buffer.emplace(count)
+        particles[...] = self._nani.default
+        particles['id'] = numpy.arange(self._last_id + 1,
+                                       self._last_id + 1 + count,
+                                       dtype=self._ATTR_ID_NUMPY_TYPE)
+        self._last_id += count
         return self._nani.view(particles)
 
     def get_particle(self, id):
@@ -301,9 +335,7 @@ class ParticleSimulation(object):
             self._presolve_callback(self)
             self.consolidate()
 
-        particles = self._array.data
-        _solve(particles, self.time_step)
-        particles['force'] = 0
+        _solve(self._array.data, self._time_step, self._always_integrate)
 
         if self._postsolve_callback:
             self._postsolve_callback(self)
@@ -329,35 +361,53 @@ class ParticleSimulation(object):
         applied to an invalid particle.
         """
         # POSTCONDITION: `self._array.data` sorted by id.
-        chunks = ([self._array.data]
-                  + [chunk for chunk in self._buffer.chunks])
-        filters = [chunk['alive'] for chunk in chunks]
-        counts = [numpy.count_nonzero(filter) for filter in filters]
-        new_size = sum(counts)
-
-        if (len(self._buffer) == 0
-                and new_size == len(self._array)):
+        old = self._array.data
+        is_alive = old['alive']
+        count = numpy.count_nonzero(is_alive)
+        added_count = len(self._buffer)
+        if added_count == 0 and count == len(old):
             return
 
-        self._array.resize(new_size, copy=False)
+        # The particles alive are compacted at the front of the array, unless
+        # they already are in place. The buffered particles are then copied
+        # right after them in a single operation, and compacted in turn if
+        # some were killed before being consolidated.
+        is_in_place = count + added_count <= self._array.capacity
+        self._array.resize(count + added_count, copy=False)
         array = self._array.data
-
-        i = 0
-        for filter, chunk, count in _zip(filters, chunks, counts):
-            if count == len(chunk):
-                array[i:i + count] = chunk
-            else:
-                numpy.compress(filter, chunk, out=array[i:i + count])
-
-            i += count
+        if count < len(old):
+            numpy.compress(is_alive, old, out=array[:count])
+        elif not is_in_place:
+            array[:count] = old
+
+        added = self._buffer.concatenate(out=array[count:])
+        is_added_alive = added['alive']
+        added_alive_count = numpy.count_nonzero(is_added_alive)
+        if added_alive_count < added_count:
+            numpy.compress(is_added_alive, added,
+                           out=added[:added_alive_count])
+            self._array.resize(count + added_alive_count)
 
         self._buffer.clear()
         self._kd_tree = None
 
 
-def _solve(particles, time_step):
-    """Solve the particles."""
+def _solve(particles, time_step, always_integrate):
+    """Solve the particles and reset their forces."""
     # Implemented as a simple Euler integration.
-    particles['velocity'] += (particles['force'] * time_step
-                              / particles['mass'][:, numpy.newaxis])
-    particles['position'] += particles['velocity'] * time_step
+    # Without any force, the velocities are left unchanged, in which case
+    # reading the masses, writing back the velocities, and resetting the
+    # forces, can be avoided. The time step is folded into the per-particle
+    # mass term to limit the number of temporaries spanning both vector
+    # components. These temporaries are not fused away by writing the
+    # intermediate results into the particle fields themselves since these
+    # are strided and unaligned, making ufuncs operating on them slower than
+    # on contiguous temporaries.
+    force = particles['force']
+    velocity = particles['velocity']
+    if always_integrate or force.any():
+        scale = numpy.divide(time_step, particles['mass'])
+        velocity += force * scale[:, numpy.newaxis]
+        force[...] = 0
+
+    particles['position'] += velocity * time_step
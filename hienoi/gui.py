@@ -2,7 +2,11 @@
 
 import collections
 import ctypes
+import functools
+import math
+import sys
 
+import numpy
 import sdl2
 
 import hienoi.renderer
@@ -10,6 +14,14 @@ from hienoi._common import GLProfile, GraphicsAPI, ParticleDisplay, UserData
 from hienoi._vectors import Vector2i, Vector2f, Vector4f
 
 
+if sys.version_info[0] == 2:
+    _range = xrange
+else:
+    _range = range
+
+_floor = math.floor
+
+
 class NavigationAction(object):
     """Enumerator for the current nagivation action.
 
@@ -38,20 +50,22 @@ _GLHandles = collections.namedtuple(
     ))
 
 
-_RGBMasks = collections.namedtuple(
-    '_RGBMasks', (
-        'red',
-        'green',
-        'blue',
-    ))
-
-
 _FIT_VIEW_REL_PADDING = 2.0
 
+# Number of events to retrieve at once from the queue.
+_EVENT_BATCH_SIZE = 32
+
 if sdl2.SDL_BYTEORDER == sdl2.SDL_LIL_ENDIAN:
-    _RGB_MASKS = _RGBMasks(red=0x000000FF, green=0x0000FF00, blue=0x00FF0000)
+    _RED_MASK, _GREEN_MASK, _BLUE_MASK = (0x000000FF, 0x0000FF00, 0x00FF0000)
 else:
-    _RGB_MASKS = _RGBMasks(red=0x00FF0000, green=0x0000FF00, blue=0x000000FF)
+    _RED_MASK, _GREEN_MASK, _BLUE_MASK = (0x00FF0000, 0x0000FF00, 0x000000FF)
+
+
+def _renderer_state_property(name):
+    """Create a property forwarding to an attribute of the renderer state."""
+    return property(
+        fget=lambda self: getattr(self._renderer_state, name),
+        fset=lambda self, value: setattr(self._renderer_state, name, value))
 
 
 class GUI(object):
@@ -175,7 +189,8 @@ class GUI(object):
             raise RuntimeError(sdl2.SDL_GetError().decode())
 
         renderer_info = hienoi.renderer.get_info()
-        if renderer_info.api == GraphicsAPI.OPENGL:
+        self._is_opengl = renderer_info.api == GraphicsAPI.OPENGL
+        if self._is_opengl:
             sdl2.SDL_GL_SetAttribute(sdl2.SDL_GL_CONTEXT_MAJOR_VERSION,
                                      renderer_info.major_version)
             sdl2.SDL_GL_SetAttribute(sdl2.SDL_GL_CONTEXT_MINOR_VERSION,
@@ -189,11 +204,78 @@ class GUI(object):
                                         renderer_info)
         self._renderer = hienoi.renderer.Renderer(**renderer)
 
+        # Function to present the frame rendered.
+        if self._is_opengl:
+            self._present = functools.partial(sdl2.SDL_GL_SwapWindow,
+                                              self._handles.window)
+        else:
+            self._present = lambda: None
+
         self._initial_view_aperture_x = view_aperture_x
         self._view_zoom_range = view_zoom_range
         self._mouse_wheel_step = mouse_wheel_step
         self._grid_adaptive_threshold = grid_adaptive_threshold
         self._on_event_callback = on_event_callback
+        self._events = (sdl2.SDL_Event * _EVENT_BATCH_SIZE)()
+        self._event_handlers = {
+            sdl2.SDL_QUIT: (
+                lambda event, scene_state: self._on_quit_event(event.quit)),
+            sdl2.SDL_WINDOWEVENT: (
+                lambda event, scene_state: self._on_window_event(
+                    event.window)),
+            sdl2.SDL_KEYDOWN: (
+                lambda event, scene_state: self._on_key_down_event(
+                    event.key, scene_state)),
+            sdl2.SDL_KEYUP: (
+                lambda event, scene_state: self._on_key_up_event(event.key)),
+            sdl2.SDL_MOUSEBUTTONDOWN: (
+                lambda event, scene_state: self._on_mouse_button_down_event(
+                    event.button)),
+            sdl2.SDL_MOUSEBUTTONUP: (
+                lambda event, scene_state: self._on_mouse_button_up_event(
+                    event.button)),
+            sdl2.SDL_MOUSEWHEEL: (
+                lambda event, scene_state: self._on_mouse_wheel_event(
+                    event.wheel)),
+            sdl2.SDL_MOUSEMOTION: (
+                lambda event, scene_state: self._on_mouse_motion_event(
+                    event.motion)),
+        }
+        self._key_down_handlers = {
+            sdl2.SDLK_SPACE: (
+                lambda scene_state: self._enable_navigation_listening()),
+            sdl2.SDLK_d: (
+                lambda scene_state: self._cycle_particle_display()),
+            sdl2.SDLK_f: self._fit_view,
+            sdl2.SDLK_g: lambda scene_state: self._toggle_grid(),
+            sdl2.SDLK_r: lambda scene_state: self._reset_view(),
+        }
+
+        # Integers reused to retrieve values from SDL.
+        self._c_int_x = ctypes.c_int()
+        self._c_int_y = ctypes.c_int()
+        self._c_int_x_ref = ctypes.byref(self._c_int_x)
+        self._c_int_y_ref = ctypes.byref(self._c_int_y)
+
+        # Cached values, invalidated whenever the window is resized or the
+        # view is zoomed.
+        self._window_size = None
+        self._view_aperture = None
+
+        # Bounds of the last particles snapshot fitted into the view, stored
+        # alongside the snapshot to detect when it has been replaced.
+        self._scene_bounds = None
+
+        # Filename of the deferred snapshot still waiting for its pixels.
+        self._pending_snapshot = None
+
+        # The renderer state is updated in-place. Attributes such as the
+        # colors and the display settings are directly stored in it rather
+        # than being copied at each frame.
+        self._renderer_state = hienoi.renderer.State(
+            initial_view_aperture_x=self._initial_view_aperture_x,
+            grid_adaptive_threshold=self._grid_adaptive_threshold)
+
         self._listen_for_navigation = False
         self._is_view_manipulated = False
 
@@ -215,14 +297,25 @@ class GUI(object):
         if initialize_callback:
             initialize_callback(self)
 
+    grid_density = _renderer_state_property('grid_density')
+    show_grid = _renderer_state_property('show_grid')
+    background_color = _renderer_state_property('background_color')
+    grid_color = _renderer_state_property('grid_color')
+    grid_origin_color = _renderer_state_property('grid_origin_color')
+    particle_display = _renderer_state_property('particle_display')
+    point_size = _renderer_state_property('point_size')
+    edge_feather = _renderer_state_property('edge_feather')
+    stroke_width = _renderer_state_property('stroke_width')
+
     @property
     def view_zoom(self):
         return self._view_zoom
 
     @view_zoom.setter
     def view_zoom(self, value):
-        self._view_zoom = max(self._view_zoom_range[0],
-                              min(self._view_zoom_range[1], value))
+        self._view_zoom = _clamp(self._view_zoom_range[0],
+                                 self._view_zoom_range[1], value)
+        self._view_aperture = None
 
     @property
     def navigation_action(self):
@@ -245,30 +338,40 @@ class GUI(object):
         """
         self._has_view_changed = False
 
-        event = sdl2.SDL_Event()
-        while sdl2.SDL_PollEvent(ctypes.byref(event)) != 0:
-            event_type = event.type
-            if event_type == sdl2.SDL_QUIT:
-                self._on_quit_event(event.quit)
-            elif event_type == sdl2.SDL_WINDOWEVENT:
-                self._on_window_event(event.window)
-            elif event_type == sdl2.SDL_KEYDOWN:
-                self._on_key_down_event(event.key, scene_state)
-            elif event_type == sdl2.SDL_KEYUP:
-                self._on_key_up_event(event.key)
-            elif event_type == sdl2.SDL_MOUSEBUTTONDOWN:
-                self._on_mouse_button_down_event(event.button)
-            elif event_type == sdl2.SDL_MOUSEBUTTONUP:
-                self._on_mouse_button_up_event(event.button)
-            elif event_type == sdl2.SDL_MOUSEWHEEL:
-                self._on_mouse_wheel_event(event.wheel)
-            elif event_type == sdl2.SDL_MOUSEMOTION:
-                self._on_mouse_motion_event(event.motion)
-
-            if self._on_event_callback:
-                self._on_event_callback(self, data, event)
-
-            if self.quit:
+        # Unlike `SDL_PollEvent()`, which pumps the events each time that it
+        # is called, the events are pumped only once here, and are then
+        # retrieved from the queue in batches into a buffer allocated once for
+        # all.
+        sdl2.SDL_PumpEvents()
+
+        # The queue being empty is the most common case.
+        if not sdl2.SDL_HasEvents(sdl2.SDL_FIRSTEVENT, sdl2.SDL_LASTEVENT):
+            return
+
+        # Bind the objects used within the loop to local variables.
+        events = self._events
+        get_event_handler = self._event_handlers.get
+        on_event_callback = self._on_event_callback
+        peep_events = sdl2.SDL_PeepEvents
+        get_event = sdl2.SDL_GETEVENT
+        first_event = sdl2.SDL_FIRSTEVENT
+        last_event = sdl2.SDL_LASTEVENT
+        while True:
+            count = peep_events(events, _EVENT_BATCH_SIZE, get_event,
+                                first_event, last_event)
+            for i in _range(count):
+                event = events[i]
+                handler = get_event_handler(event.type)
+                if handler is not None:
+                    handler(event, scene_state)
+
+                if on_event_callback:
+                    on_event_callback(self, data, event)
+
+                if self.quit:
+                    return
+
+            if count < _EVENT_BATCH_SIZE:
                 break
 
     def render(self, scene_state):
@@ -279,34 +382,25 @@ class GUI(object):
         scene_state : hienoi.renderer.SceneState
             Scene state.
         """
-        renderer_state = hienoi.renderer.State(
-            window_size=self.get_window_size(),
-            view_position=self.view_position,
-            view_zoom=self._view_zoom,
-            origin=self.world_to_screen(Vector2f(0.0, 0.0)),
-            initial_view_aperture_x=self._initial_view_aperture_x,
-            view_aperture=self.get_view_aperture(),
-            grid_density=self.grid_density,
-            grid_adaptive_threshold=self._grid_adaptive_threshold,
-            background_color=self.background_color,
-            grid_color=self.grid_color,
-            grid_origin_color=self.grid_origin_color,
-            show_grid=self.show_grid,
-            particle_display=self.particle_display,
-            point_size=self.point_size,
-            edge_feather=self.edge_feather,
-            stroke_width=self.stroke_width,
-        )
+        renderer_state = self._renderer_state
+        renderer_state.window_size = self._get_window_size()
+        renderer_state.view_position = self.view_position
+        renderer_state.view_zoom = self._view_zoom
+        renderer_state.origin = self.world_to_screen(Vector2f(0.0, 0.0))
+        renderer_state.view_aperture = self._get_view_aperture()
 
         self._renderer.render(renderer_state, scene_state)
-
-        if hienoi.renderer.get_info().api == GraphicsAPI.OPENGL:
-            sdl2.SDL_GL_SwapWindow(self._handles.window)
+        self._present()
 
     def terminate(self):
         """Cleanup the GUI resources."""
+        if self._pending_snapshot is not None:
+            _write_bmp(self._pending_snapshot,
+                       self._renderer.read_pending_pixels())
+            self._pending_snapshot = None
+
         self._renderer.cleanup()
-        if hienoi.renderer.get_info().api == GraphicsAPI.OPENGL:
+        if self._is_opengl:
             sdl2.SDL_GL_DeleteContext(self._handles.renderer.context)
 
         sdl2.SDL_DestroyWindow(self._handles.window)
@@ -320,12 +414,7 @@ class GUI(object):
         hienoi.Vector2i
             The window size.
         """
-        window_size_x = ctypes.c_int()
-        window_size_y = ctypes.c_int()
-        sdl2.SDL_GetWindowSize(self._handles.window,
-                               ctypes.byref(window_size_x),
-                               ctypes.byref(window_size_y))
-        return Vector2i(window_size_x.value, window_size_y.value)
+        return Vector2i(*self._get_window_size())
 
     def get_view_aperture(self):
         """Retrieve the view aperture.
@@ -337,9 +426,39 @@ class GUI(object):
         hienoi.Vector2f
             The view aperture.
         """
-        window_size = self.get_window_size()
-        aperture_x = self._initial_view_aperture_x / self._view_zoom
-        return Vector2f(aperture_x, aperture_x * window_size.y / window_size.x)
+        return Vector2f(*self._get_view_aperture())
+
+    def _get_window_size(self):
+        """Retrieve the window size shared with the internal code."""
+        if self._window_size is None:
+            sdl2.SDL_GetWindowSize(self._handles.window,
+                                   self._c_int_x_ref, self._c_int_y_ref)
+            self._window_size = Vector2i(self._c_int_x.value,
+                                         self._c_int_y.value)
+
+        return self._window_size
+
+    def _get_view_aperture(self):
+        """Retrieve the view aperture shared with the internal code."""
+        if self._view_aperture is None:
+            window_size = self._get_window_size()
+            aperture_x = self._initial_view_aperture_x / self._view_zoom
+            self._view_aperture = Vector2f(
+                aperture_x, aperture_x * window_size.y / window_size.x)
+
+        return self._view_aperture
+
+    def _get_scene_bounds(self, scene_state):
+        """Retrieve the lower and upper bounds of the scene particles."""
+        particles = scene_state.particles
+        if (self._scene_bounds is None
+                or self._scene_bounds[0] is not particles):
+            position = particles['position']
+            self._scene_bounds = (particles,
+                                  Vector2f(*numpy.amin(position, axis=0)),
+                                  Vector2f(*numpy.amax(position, axis=0)))
+
+        return self._scene_bounds[1:]
 
     def get_mouse_position(self):
         """Retrieve the mouse position in screen space.
@@ -349,11 +468,8 @@ class GUI(object):
         hienoi.Vector2i
             The mouse position.
         """
-        position_x = ctypes.c_int()
-        position_y = ctypes.c_int()
-        sdl2.SDL_GetMouseState(ctypes.byref(position_x),
-                               ctypes.byref(position_y))
-        return Vector2i(position_x.value, position_y.value)
+        sdl2.SDL_GetMouseState(self._c_int_x_ref, self._c_int_y_ref)
+        return Vector2i(self._c_int_x.value, self._c_int_y.value)
 
     def get_screen_to_world_ratio(self):
         """Retrieve the ratio to convert a sreen unit into a world unit.
@@ -363,7 +479,7 @@ class GUI(object):
         float
             The screen to world ratio.
         """
-        window_size = self.get_window_size()
+        window_size = self._get_window_size()
         aperture_x = self._initial_view_aperture_x / self._view_zoom
         return aperture_x / window_size.x
 
@@ -380,15 +496,12 @@ class GUI(object):
         hienoi.Vector2f
             The point in world space coordinates.
         """
-        window_size = self.get_window_size()
-        view_aperture = self.get_view_aperture()
-        return Vector2f(
-            (self.view_position.x
-             + (point.x - window_size.x / 2.0)
-             * view_aperture.x / window_size.x),
-            (self.view_position.y
-             - (point.y - window_size.y / 2.0)
-             * view_aperture.y / window_size.y))
+        window_size = self._get_window_size()
+        view_aperture = self._get_view_aperture()
+        return Vector2f(*_screen_to_world(
+            point.x, point.y, window_size.x, window_size.y,
+            self.view_position.x, self.view_position.y,
+            view_aperture.x, view_aperture.y))
 
     def world_to_screen(self, point):
         """Convert a point from world space to screen space coordinates.
@@ -403,32 +516,34 @@ class GUI(object):
         hienoi.Vector2i
             The point in screen space coordinates.
         """
-        window_size = self.get_window_size()
-        view_aperture = self.get_view_aperture()
-        return Vector2i(
-            int(round(
-                (window_size.x / view_aperture.x)
-                * (-self.view_position.x + point.x + view_aperture.x / 2.0))),
-            int(round(
-                (window_size.y / view_aperture.y)
-                * (self.view_position.y - point.y + view_aperture.y / 2.0))))
-
-    def write_snapshot(self, filename):
+        window_size = self._get_window_size()
+        view_aperture = self._get_view_aperture()
+        return Vector2i(*_world_to_screen(
+            point.x, point.y, window_size.x, window_size.y,
+            self.view_position.x, self.view_position.y,
+            view_aperture.x, view_aperture.y))
+
+    def write_snapshot(self, filename, deferred=False):
         """Take a snapshot of the view and write it as a BMP image.
 
         Parameters
         ----------
         filename : str
             Destination filename.
+        deferred : bool
+            True to read the pixels asynchronously to avoid stalling the
+            rendering. The image is then only written upon the next deferred
+            snapshot or when the GUI is terminated.
         """
-        pixel_size = 4
-        pixels = self._renderer.read_pixels()
-        surface = sdl2.SDL_CreateRGBSurfaceFrom(
-            pixels.data, pixels.width, pixels.height,
-            8 * pixel_size, pixels.width * pixel_size,
-            _RGB_MASKS.red, _RGB_MASKS.green, _RGB_MASKS.blue, 0)
-        sdl2.SDL_SaveBMP(surface, filename)
-        sdl2.SDL_FreeSurface(surface)
+        if not deferred:
+            _write_bmp(filename, self._renderer.read_pixels())
+            return
+
+        pixels = self._renderer.read_pixels_async()
+        if pixels is not None:
+            _write_bmp(self._pending_snapshot, pixels)
+
+        self._pending_snapshot = filename
 
     def _reset_view(self):
         """Reset the view position and zoom."""
@@ -439,24 +554,25 @@ class GUI(object):
     def _fit_view(self, scene_state):
         """Fit the view to the scene."""
         if len(scene_state.particles) > 1:
-            window_size = self.get_window_size()
-            initial_size = Vector2f(
-                self._initial_view_aperture_x,
-                self._initial_view_aperture_x * window_size.y / window_size.x)
-
-            lower_bounds = scene_state.lower_bounds
-            upper_bounds = scene_state.upper_bounds
-            required_size = (upper_bounds - lower_bounds).iscale(
-                _FIT_VIEW_REL_PADDING)
-            required_size = Vector2f(
-                max(required_size.x,
-                    initial_size.x * self._view_zoom_range[0]),
-                max(required_size.y,
-                    initial_size.y * self._view_zoom_range[0]))
-
-            self.view_position = (lower_bounds + upper_bounds).iscale(0.5)
-            self.view_zoom = min(initial_size.x / required_size.x,
-                                 initial_size.y / required_size.y)
+            # Scalar arithmetic is used over vector operations to avoid
+            # creating temporary vector objects.
+            window_size = self._get_window_size()
+            initial_size_x = self._initial_view_aperture_x
+            initial_size_y = initial_size_x * window_size.y / window_size.x
+
+            lower, upper = self._get_scene_bounds(scene_state)
+            lower_x, lower_y = lower
+            upper_x, upper_y = upper
+            min_zoom = self._view_zoom_range[0]
+            required_size_x = max((upper_x - lower_x) * _FIT_VIEW_REL_PADDING,
+                                  initial_size_x * min_zoom)
+            required_size_y = max((upper_y - lower_y) * _FIT_VIEW_REL_PADDING,
+                                  initial_size_y * min_zoom)
+
+            self.view_position = Vector2f((lower_x + upper_x) * 0.5,
+                                          (lower_y + upper_y) * 0.5)
+            self.view_zoom = min(initial_size_x / required_size_x,
+                                 initial_size_y / required_size_y)
         elif len(scene_state.particles) == 1:
             self.view_position = Vector2f(
                 *scene_state.particles['position'][0])
@@ -466,6 +582,19 @@ class GUI(object):
 
         self._has_view_changed = True
 
+    def _enable_navigation_listening(self):
+        """Listen for mouse events to navigate the view."""
+        self._listen_for_navigation = True
+
+    def _cycle_particle_display(self):
+        """Switch to the next particle display."""
+        self.particle_display = (
+            (self.particle_display + 1) % (ParticleDisplay._LAST + 1))
+
+    def _toggle_grid(self):
+        """Show or hide the grid."""
+        self.show_grid = not self.show_grid
+
     def _on_quit_event(self, event):
         """Event 'on quit'."""
         self.quit = True
@@ -473,24 +602,19 @@ class GUI(object):
     def _on_window_event(self, event):
         """Event 'on window'."""
         if event.event == sdl2.SDL_WINDOWEVENT_SIZE_CHANGED:
+            self._window_size = None
+            self._view_aperture = None
             self._renderer.resize(event.data1, event.data2)
 
     def _on_key_down_event(self, event, scene_state):
         """Event 'on key down'."""
-        code = event.keysym.sym
-        modifier = event.keysym.mod
-        if modifier == sdl2.KMOD_NONE:
-            if code == sdl2.SDLK_SPACE:
-                self._listen_for_navigation = True
-            elif code == sdl2.SDLK_d:
-                self.particle_display = (
-                    (self.particle_display + 1) % (ParticleDisplay._LAST + 1))
-            elif code == sdl2.SDLK_f:
-                self._fit_view(scene_state)
-            elif code == sdl2.SDLK_g:
-                self.show_grid = not self.show_grid
-            elif code == sdl2.SDLK_r:
-                self._reset_view()
+        keysym = event.keysym
+        if keysym.mod != sdl2.KMOD_NONE:
+            return
+
+        handler = self._key_down_handlers.get(keysym.sym)
+        if handler is not None:
+            handler(scene_state)
 
     def _on_key_up_event(self, event):
         """Event 'on key up'."""
@@ -514,29 +638,98 @@ class GUI(object):
 
     def _on_mouse_wheel_event(self, event):
         """Event 'on mouse wheel'."""
+        # The zoom is set directly rather than through the property to avoid
+        # the overhead of the property's getter and setter.
         scale = 1.0 + self._mouse_wheel_step * event.y
-        self.view_zoom *= scale
+        self._view_zoom = _clamp(self._view_zoom_range[0],
+                                 self._view_zoom_range[1],
+                                 self._view_zoom * scale)
+        self._view_aperture = None
         self._has_view_changed = True
 
     def _on_mouse_motion_event(self, event):
         """Event 'on mouse motion'."""
-        window_size = self.get_window_size()
-        view_aperture = self.get_view_aperture()
+        if self._navigation_action == NavigationAction.NONE:
+            return
+
+        # Read each value only once since accessing the fields of the ctypes
+        # structures and vectors is not free.
+        relative_x = float(event.xrel)
+        relative_y = float(event.yrel)
+        window_size_x, window_size_y = self._get_window_size()
         if self._navigation_action == NavigationAction.MOVE:
-            self.view_position.set(
-                (self.view_position.x
-                 - event.xrel * view_aperture.x / window_size.x),
-                (self.view_position.y
-                 + event.yrel * view_aperture.y / window_size.y))
+            view_aperture_x, view_aperture_y = self._get_view_aperture()
+            view_position = self.view_position
+            view_position_x, view_position_y = view_position
+            view_position.set(
+                view_position_x - relative_x * view_aperture_x / window_size_x,
+                view_position_y + relative_y * view_aperture_y / window_size_y)
             self._has_view_changed = True
         elif self._navigation_action == NavigationAction.ZOOM:
             scale = (1.0
-                     + float(event.xrel) / window_size.x
-                     - float(event.yrel) / window_size.y)
-            self.view_zoom *= scale
+                     + relative_x / window_size_x
+                     - relative_y / window_size_y)
+            self._view_zoom = _clamp(self._view_zoom_range[0],
+                                     self._view_zoom_range[1],
+                                     self._view_zoom * scale)
+            self._view_aperture = None
             self._has_view_changed = True
 
 
+def _write_bmp(filename, pixels):
+    """Write pixels data as a BMP image."""
+    pixel_size = 4
+
+    # The surface points directly to the memory of the pixel data, as ctypes
+    # passes byte strings by reference without copying them.
+    surface = sdl2.SDL_CreateRGBSurfaceFrom(
+        pixels.data, pixels.width, pixels.height,
+        8 * pixel_size, pixels.width * pixel_size,
+        _RED_MASK, _GREEN_MASK, _BLUE_MASK, 0)
+    if not surface:
+        raise RuntimeError(sdl2.SDL_GetError().decode())
+
+    try:
+        if sdl2.SDL_SaveBMP(surface, filename.encode()) != 0:
+            raise RuntimeError(sdl2.SDL_GetError().decode())
+    finally:
+        sdl2.SDL_FreeSurface(surface)
+
+
+def _clamp(lower, upper, value):
+    """Clamp a value within a range."""
+    return lower if value < lower else upper if value > upper else value
+
+
+def _screen_to_world(point_x, point_y, window_size_x, window_size_y,
+                     view_position_x, view_position_y,
+                     view_aperture_x, view_aperture_y):
+    """Convert a point from screen space to world space coordinates."""
+    return (
+        (view_position_x
+         + (point_x - window_size_x / 2.0)
+         * view_aperture_x / window_size_x),
+        (view_position_y
+         - (point_y - window_size_y / 2.0)
+         * view_aperture_y / window_size_y))
+
+
+def _world_to_screen(point_x, point_y, window_size_x, window_size_y,
+                     view_position_x, view_position_y,
+                     view_aperture_x, view_aperture_y):
+    """Convert a point from world space to screen space coordinates."""
+    # Values are rounded half up.
+    scale_x = window_size_x / view_aperture_x
+    scale_y = window_size_y / view_aperture_y
+    return (
+        int(_floor(
+            scale_x * (point_x - view_position_x + view_aperture_x * 0.5)
+            + 0.5)),
+        int(_floor(
+            scale_y * (view_position_y - point_y + view_aperture_y * 0.5)
+            + 0.5)))
+
+
 def _create_handles(window_title, window_position, window_size, window_flags,
                     renderer_info):
     """Create the SDL2 handles."""
@@ -2,42 +2,31 @@
 
 import collections
 import ctypes
-import itertools
+import hashlib
 import math
-import operator
 import os
-import sys
+import struct
 
 import numpy
-import OpenGL
 import OpenGL.GL as gl
 
+try:
+    from OpenGL.GL.ARB import get_program_binary as _get_program_binary
+except ImportError:
+    _get_program_binary = None
+
+try:
+    from OpenGL.GL.ARB import (
+        parallel_shader_compile as _parallel_shader_compile)
+except ImportError:
+    _parallel_shader_compile = None
+
 import hienoi._common
 import hienoi._numeric
 from hienoi._common import GraphicsAPI, GLProfile, ParticleDisplay
 from hienoi._vectors import Vector2f
 
 
-if sys.version_info[0] == 2:
-    def _accumulate(iterable, function=operator.add):
-        iterator = iter(iterable)
-        try:
-            total = next(iterator)
-        except StopIteration:
-            return
-
-        yield total
-        for element in iterator:
-            total = function(total, element)
-            yield total
-else:
-    _accumulate = itertools.accumulate
-
-
-OpenGL.ERROR_CHECKING = False
-OpenGL.ERROR_ON_COPY = True
-
-
 class VertexLayout(object):
     """Enumerator for the OpenGL vertex layouts.
 
@@ -56,7 +45,9 @@ _VertexFormat = collections.namedtuple(
         'vao',
         'vbo',
         'attributes',
+        'offsets',
         'size',
+        'stride',
         'dtype',
     ))
 
@@ -70,6 +61,7 @@ _VertexAttribute = collections.namedtuple(
         'size',
         'normalized',
         'divisor',
+        'dtype',
     ))
 
 
@@ -107,6 +99,13 @@ _INFO = Info(
     minor_version=3,
     profile=GLProfile.CORE)
 
+# Minimum number of particles for which it becomes worth culling the ones
+# outside of the view before uploading them.
+_CULLING_MIN_PARTICLE_COUNT = 1024
+
+# Header of the cached program binaries, storing their binary format.
+_PROGRAM_BINARY_HEADER = '<I'
+
 _BUFFERS = (
     {
         'type': 'vao',
@@ -116,6 +115,14 @@ _BUFFERS = (
         'type': 'vbo',
         'names': ('particles',),
     },
+    {
+        'type': 'pbo',
+        'names': ('pixels_0', 'pixels_1'),
+    },
+    {
+        'type': 'ubo',
+        'names': ('grid',),
+    },
 )
 
 _PROGRAMS = (
@@ -161,10 +168,6 @@ _PROGRAMS = (
 )
 
 _UNIFORMS = (
-    {
-        'program': 'grid',
-        'names': ('origin', 'unit', 'color', 'origin_color'),
-    },
     {
         'program': 'particles',
         'names': ('projection', 'half_edge_feather', 'half_stroke_width',
@@ -176,6 +179,23 @@ _UNIFORMS = (
     },
 )
 
+_UNIFORM_BLOCKS = (
+    {
+        'program': 'grid',
+        'name': 'Grid',
+        'binding': 0,
+    },
+)
+
+# Memory layout of the 'Grid' uniform block, following the std140 rules.
+_GRID_BLOCK_DTYPE = numpy.dtype({
+    'names': ('color', 'origin_color', 'origin', 'unit'),
+    'formats': ((numpy.float32, (4,)), (numpy.float32, (4,)),
+                (numpy.int32, (2,)), numpy.float32),
+    'offsets': (0, 16, 32, 40),
+    'itemsize': 48,
+})
+
 _VERTEX_FORMATS = (
     {
         'name': 'particle',
@@ -188,7 +208,8 @@ _VERTEX_FORMATS = (
                 'count': hienoi._common.PARTICLE_ATTRS.position.count,
                 'type': hienoi._numeric.to_gl(
                     hienoi._common.PARTICLE_ATTRS.position.element_type),
-                'normalized': gl.GL_FALSE,
+                'normalized': (
+                    hienoi._common.PARTICLE_ATTRS.position.normalized),
                 'divisor': 1,
             },
             {
@@ -197,7 +218,8 @@ _VERTEX_FORMATS = (
                 'count': hienoi._common.PARTICLE_ATTRS.size.count,
                 'type': hienoi._numeric.to_gl(
                     hienoi._common.PARTICLE_ATTRS.size.element_type),
-                'normalized': gl.GL_FALSE,
+                'normalized': (
+                    hienoi._common.PARTICLE_ATTRS.size.normalized),
                 'divisor': 1,
             },
             {
@@ -206,7 +228,8 @@ _VERTEX_FORMATS = (
                 'count': hienoi._common.PARTICLE_ATTRS.color.count,
                 'type': hienoi._numeric.to_gl(
                     hienoi._common.PARTICLE_ATTRS.color.element_type),
-                'normalized': gl.GL_FALSE,
+                'normalized': (
+                    hienoi._common.PARTICLE_ATTRS.color.normalized),
                 'divisor': 1,
             },
         ),
@@ -222,7 +245,8 @@ _VERTEX_FORMATS = (
                 'count': hienoi._common.PARTICLE_ATTRS.position.count,
                 'type': hienoi._numeric.to_gl(
                     hienoi._common.PARTICLE_ATTRS.position.element_type),
-                'normalized': gl.GL_FALSE,
+                'normalized': (
+                    hienoi._common.PARTICLE_ATTRS.position.normalized),
             },
             {
                 'name': 'color',
@@ -230,37 +254,20 @@ _VERTEX_FORMATS = (
                 'count': hienoi._common.PARTICLE_ATTRS.color.count,
                 'type': hienoi._numeric.to_gl(
                     hienoi._common.PARTICLE_ATTRS.color.element_type),
-                'normalized': gl.GL_FALSE,
+                'normalized': (
+                    hienoi._common.PARTICLE_ATTRS.color.normalized),
             },
         ),
     },
 )
 
 
-_State = collections.namedtuple(
-    'State', (
-        'window_size',
-        'view_position',
-        'view_zoom',
-        'origin',
-        'initial_view_aperture_x',
-        'view_aperture',
-        'grid_density',
-        'grid_adaptive_threshold',
-        'background_color',
-        'grid_color',
-        'grid_origin_color',
-        'show_grid',
-        'particle_display',
-        'point_size',
-        'edge_feather',
-        'stroke_width',
-    ))
-
-
-class State(_State):
+class State(object):
     """Renderer state.
 
+    Unlike the other data structures passed to the renderer, this one is
+    mutable so that a single instance can be updated in-place at each frame.
+
     Attributes
     ----------
     window_size : hienoi.Vector2i
@@ -309,7 +316,58 @@ class State(_State):
         such as  :attr:`~hienoi.ParticleDisplay.CIRCLE`.
     """
 
-    __slots__ = ()
+    __slots__ = (
+        'window_size',
+        'view_position',
+        'view_zoom',
+        'origin',
+        'initial_view_aperture_x',
+        'view_aperture',
+        'grid_density',
+        'grid_adaptive_threshold',
+        'background_color',
+        'grid_color',
+        'grid_origin_color',
+        'show_grid',
+        'particle_display',
+        'point_size',
+        'edge_feather',
+        'stroke_width',
+    )
+
+    def __init__(self,
+                 window_size=None,
+                 view_position=None,
+                 view_zoom=None,
+                 origin=None,
+                 initial_view_aperture_x=None,
+                 view_aperture=None,
+                 grid_density=None,
+                 grid_adaptive_threshold=None,
+                 background_color=None,
+                 grid_color=None,
+                 grid_origin_color=None,
+                 show_grid=None,
+                 particle_display=None,
+                 point_size=None,
+                 edge_feather=None,
+                 stroke_width=None):
+        self.window_size = window_size
+        self.view_position = view_position
+        self.view_zoom = view_zoom
+        self.origin = origin
+        self.initial_view_aperture_x = initial_view_aperture_x
+        self.view_aperture = view_aperture
+        self.grid_density = grid_density
+        self.grid_adaptive_threshold = grid_adaptive_threshold
+        self.background_color = background_color
+        self.grid_color = grid_color
+        self.grid_origin_color = grid_origin_color
+        self.show_grid = show_grid
+        self.particle_display = particle_display
+        self.point_size = point_size
+        self.edge_feather = edge_feather
+        self.stroke_width = stroke_width
 
 
 _SceneState = collections.namedtuple(
@@ -365,6 +423,101 @@ class Pixels(_Pixels):
     __slots__ = ()
 
 
+class _Group(object):
+    """Group of named values.
+
+    The values are accessible as attributes, and the group can also be
+    iterated over and indexed like a tuple, in the order of definition.
+
+    Parameters
+    ----------
+    items : iterable of (str, object)
+        Names and values.
+    """
+
+    def __init__(self, items):
+        items = tuple(items)
+        self._values = tuple(value for _, value in items)
+        for name, value in items:
+            setattr(self, name, value)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+
+class _GLStateCache(object):
+    """Shadow copy of the OpenGL state last set by the renderer.
+
+    Binding calls and uniform updates are only forwarded to OpenGL when they
+    would change the current state, which avoids redundant calls when
+    rendering frames that are identical or near identical.
+    """
+
+    __slots__ = ('program', 'vao', 'array_buffer', 'uniforms',)
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget about the state, forcing the next calls to go through."""
+        self.program = None
+        self.vao = None
+        self.array_buffer = None
+        self.uniforms = {}
+
+    def use_program(self, program):
+        """Install a program as part of the current rendering state."""
+        if program != self.program:
+            gl.glUseProgram(program)
+            self.program = program
+
+    def bind_vao(self, vao):
+        """Bind a vertex array object."""
+        if vao != self.vao:
+            gl.glBindVertexArray(vao)
+            self.vao = vao
+
+    def bind_array_buffer(self, vbo):
+        """Bind a buffer object to the vertex attributes target."""
+        if vbo != self.array_buffer:
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vbo)
+            self.array_buffer = vbo
+
+    def set_uniform(self, function, location, *values):
+        """Set a uniform value for the program currently in use."""
+        key = (self.program, location)
+        if self.uniforms.get(key) != values:
+            function(location, *values)
+            self.uniforms[key] = values
+
+    def set_uniform_matrix(self, location, matrix):
+        """Set a 4x4 matrix uniform for the program currently in use."""
+        key = (self.program, location)
+        value = bytes(matrix)
+        if self.uniforms.get(key) != value:
+            gl.glUniformMatrix4fv(location, 1, gl.GL_FALSE, matrix)
+            self.uniforms[key] = value
+
+
+class _DrawBundle(object):
+    """OpenGL objects required to draw the particles with a given display."""
+
+    __slots__ = ('program', 'vao', 'vbo', 'uniforms', 'vertex_format',)
+
+    def __init__(self, program, vao, vbo, uniforms, vertex_format):
+        self.program = program
+        self.vao = vao
+        self.vbo = vbo
+        self.uniforms = uniforms
+        self.vertex_format = vertex_format
+
+
 class Renderer(object):
     """Renderer.
 
@@ -376,20 +529,64 @@ class Renderer(object):
     """
 
     def __init__(self,
-                 vertex_layout=VertexLayout.INTERLEAVED):
+                 vertex_layout=VertexLayout.PACKED):
         gl.glEnable(gl.GL_BLEND)
         gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
 
         self._bufs = _generate_buffers(_BUFFERS)
         self._programs = _create_programs(_PROGRAMS)
         self._uniforms = _get_uniform_locations(_UNIFORMS, self._programs)
+        _bind_uniform_blocks(_UNIFORM_BLOCKS, self._programs)
         self._vertex_formats = _get_vertex_formats(_VERTEX_FORMATS, self._bufs)
 
         self._vbo_capacities = {vbo: 0 for vbo in self._bufs.vbo}
         self._vertex_layout = vertex_layout
-
+        self._gl_state = _GLStateCache()
+
+        point_bundle = _DrawBundle(
+            program=self._programs.point_particles,
+            vao=self._bufs.vao.point_particles,
+            vbo=self._bufs.vbo.particles,
+            uniforms=self._uniforms.point_particles,
+            vertex_format=self._vertex_formats.point_particle)
+        billboard_bundle = _DrawBundle(
+            program=self._programs.particles,
+            vao=self._bufs.vao.particles,
+            vbo=self._bufs.vbo.particles,
+            uniforms=self._uniforms.particles,
+            vertex_format=self._vertex_formats.particle)
+        self._draw_bundles = {
+            ParticleDisplay.POINT: point_bundle,
+            ParticleDisplay.CIRCLE: billboard_bundle,
+            ParticleDisplay.DISC: billboard_bundle,
+        }
+        self._projection = (ctypes.c_float * 16)()
+        self._projection_key = None
+        self._grid_unit = None
+        self._grid_unit_key = None
+
+        # The grid uniforms are uploaded all at once, and only when their
+        # values differ from the ones of the previous upload.
+        self._grid_block = numpy.zeros(1, dtype=_GRID_BLOCK_DTYPE)
+        self._grid_block_data = None
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._bufs.ubo.grid)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, _GRID_BLOCK_DTYPE.itemsize,
+                        None, gl.GL_DYNAMIC_DRAW)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, 0, self._bufs.ubo.grid)
+
+        # Asynchronous pixel reads alternate between the two PBOs. Each entry
+        # holds the size of the pixel rectangle being read into the PBO of
+        # the same index, if any.
+        self._pbo_index = 0
+        self._pbo_sizes = [0] * len(self._bufs.pbo)
+        self._pixel_reads = [None] * len(self._bufs.pbo)
+
+        # VBO capacity for which the vertex attributes of each vertex format,
+        # identified by their VAO, have been set.
+        self._attribute_capacities = {}
         for vertex_format in self._vertex_formats:
             _set_vertex_attributes(vertex_format, self._vertex_layout, 0)
+            self._attribute_capacities[vertex_format.vao] = 0
 
     def render(self, state, scene_state):
         """Render a new frame.
@@ -407,10 +604,8 @@ class Renderer(object):
         if state.show_grid:
             self._draw_grid(state)
 
-        projection = _get_projection_matrix(
-            state.window_size, state.view_position, state.view_zoom,
-            state.view_aperture, state.initial_view_aperture_x)
-        self._draw_particles(scene_state.particles, projection, state)
+        self._draw_particles(scene_state.particles,
+                             self._get_projection(state), state)
 
     def resize(self, width, height):
         """Resize the OpenGL viewport.
@@ -429,8 +624,12 @@ class Renderer(object):
         for program in self._programs:
             gl.glDeleteProgram(program)
 
-        gl.glDeleteBuffers(len(self._bufs.vbo), self._bufs.vbo)
-        gl.glDeleteBuffers(len(self._bufs.vao), self._bufs.vao)
+        gl.glDeleteVertexArrays(len(self._bufs.vao),
+                                _to_uint_array(self._bufs.vao))
+        for bufs in (self._bufs.vbo, self._bufs.pbo, self._bufs.ubo):
+            gl.glDeleteBuffers(len(bufs), _to_uint_array(bufs))
+
+        self._gl_state.invalidate()
 
     def read_pixels(self):
         """Read the pixels from the buffer.
@@ -448,70 +647,177 @@ class Renderer(object):
                       width=int(width),
                       height=int(height))
 
+    def read_pixels_async(self):
+        """Read the pixels from the buffer without waiting for the rendering.
+
+        The pixels are read into a pixel buffer object and are only retrieved
+        on the next call, by which time the transfer has most likely been
+        completed, thus avoiding to stall the rendering pipeline.
+
+        Returns
+        -------
+        hienoi.renderer.Pixels
+            Pixels data from the previous call, or None if there is none.
+        """
+        _, _, width, height = gl.glGetIntegerv(gl.GL_VIEWPORT)
+        width = int(width)
+        height = int(height)
+        size = width * height * 4
+
+        index = self._pbo_index
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._bufs.pbo[index])
+        if size != self._pbo_sizes[index]:
+            gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, size, None,
+                            gl.GL_STREAM_READ)
+            self._pbo_sizes[index] = size
+
+        gl.glReadPixels(0, 0,
+                        width, height,
+                        gl.GL_RGBA, gl.GL_UNSIGNED_BYTE,
+                        ctypes.c_void_p(0))
+        self._pixel_reads[index] = (width, height)
+
+        self._pbo_index = index ^ 1
+        pixels = self._retrieve_pixels(self._pbo_index)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        return pixels
+
+    def read_pending_pixels(self):
+        """Retrieve the pixels from the last asynchronous read.
+
+        Returns
+        -------
+        hienoi.renderer.Pixels
+            Pixels data from the last call to :meth:`read_pixels_async`, or
+            None if they have already been retrieved.
+        """
+        pixels = self._retrieve_pixels(self._pbo_index ^ 1)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        return pixels
+
+    def _retrieve_pixels(self, index):
+        """Retrieve the pixels read into a PBO."""
+        pixel_read = self._pixel_reads[index]
+        if pixel_read is None:
+            return None
+
+        width, height = pixel_read
+        size = width * height * 4
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._bufs.pbo[index])
+        address = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, size,
+                                      gl.GL_MAP_READ_BIT)
+        if not address:
+            raise RuntimeError("Could not map the pixels PBO.")
+
+        try:
+            data = ctypes.string_at(address, size)
+        finally:
+            gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+
+        self._pixel_reads[index] = None
+        return Pixels(data=data,
+                      width=width,
+                      height=height)
+
+    def _get_projection(self, state):
+        """Retrieve the projection matrix, rebuilding it only if needed."""
+        # The vectors might be updated in-place, hence why only their values
+        # can be used to identify a state.
+        key = (tuple(state.window_size), tuple(state.view_position),
+               state.view_zoom, tuple(state.view_aperture),
+               state.initial_view_aperture_x)
+        if key != self._projection_key:
+            self._projection[:] = _get_projection_matrix(
+                state.window_size, state.view_position, state.view_zoom,
+                state.view_aperture, state.initial_view_aperture_x)
+            self._projection_key = key
+
+        return self._projection
+
+    def _get_grid_unit(self, state):
+        """Retrieve the grid unit, recomputing it only if needed."""
+        key = (state.window_size.x, state.view_zoom,
+               state.grid_adaptive_threshold, state.grid_density)
+        if key != self._grid_unit_key:
+            self._grid_unit = _get_screen_space_grid_unit(state)
+            self._grid_unit_key = key
+
+        return self._grid_unit
+
     def _draw_grid(self, state):
         """Draw the grid."""
-        unit = _get_screen_space_grid_unit(state)
+        unit = self._get_grid_unit(state)
 
         # The grid drawing logic mostly happens in the fragment shader, on a
         # billboard of the size of the screen. The billboard is generated by
         # sending 4 vertices to the vertex shader which then sets their
         # position. Since no vertex attributes are required, no VBOs are
         # passed, and only a dummy (empty) VAO is being used.
-        gl.glUseProgram(self._programs.grid)
-        gl.glBindVertexArray(self._bufs.vao.dummy)
-        gl.glUniform2i(self._uniforms.grid.origin,
-                       state.origin.x, state.window_size.y - state.origin.y)
-        gl.glUniform1f(self._uniforms.grid.unit, unit)
-        gl.glUniform4f(self._uniforms.grid.color, *state.grid_color)
-        gl.glUniform4f(self._uniforms.grid.origin_color,
-                       *state.grid_origin_color)
+        block = self._grid_block
+        block['color'] = tuple(state.grid_color)
+        block['origin_color'] = tuple(state.grid_origin_color)
+        block['origin'] = (state.origin.x,
+                           state.window_size.y - state.origin.y)
+        block['unit'] = unit
+        data = block.tobytes()
+        if data != self._grid_block_data:
+            gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._bufs.ubo.grid)
+            gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, len(data), block)
+            self._grid_block_data = data
+
+        gl_state = self._gl_state
+        gl_state.use_program(self._programs.grid)
+        gl_state.bind_vao(self._bufs.vao.dummy)
         gl.glDrawArrays(gl.GL_TRIANGLE_STRIP, 0, 4)
 
     def _draw_particles(self, particles, projection, state):
         """Draw the particles."""
-        particle_count = len(particles)
-        if state.particle_display == ParticleDisplay.POINT:
-            program = self._programs.point_particles
-            vao = self._bufs.vao.point_particles
-            vbo = self._bufs.vbo.particles
-            uniforms = self._uniforms.point_particles
-            vertex_format = self._vertex_formats.point_particle
-        else:
-            program = self._programs.particles
-            vao = self._bufs.vao.particles
-            vbo = self._bufs.vbo.particles
-            uniforms = self._uniforms.particles
-            vertex_format = self._vertex_formats.particle
+        if len(particles) >= _CULLING_MIN_PARTICLE_COUNT:
+            particles = _cull_particles(particles, state)
 
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vbo)
+        particle_count = len(particles)
+        bundle = self._draw_bundles[state.particle_display]
+        program = bundle.program
+        vao = bundle.vao
+        vbo = bundle.vbo
+        uniforms = bundle.uniforms
+        vertex_format = bundle.vertex_format
+
+        gl_state = self._gl_state
+        gl_state.bind_array_buffer(vbo)
         vbo_capacity = self._vbo_capacities[vbo]
 
-        size = vertex_format.size * particle_count
+        if self._vertex_layout == VertexLayout.INTERLEAVED:
+            vertex_size = vertex_format.stride
+        elif self._vertex_layout == VertexLayout.PACKED:
+            vertex_size = vertex_format.size
+
+        size = vertex_size * particle_count
         if size > vbo_capacity:
-            vbo_capacity = _grow_capacity(size, vbo_capacity, 2.0)
+            # Double the capacity, rounded up to a whole number of vertices.
+            vbo_capacity = max(size, vbo_capacity * 2)
+            vbo_capacity += -vbo_capacity % vertex_size
             self._reserve_vbo(vbo_capacity)
             self._vbo_capacities[vbo] = vbo_capacity
 
-        if self._vertex_layout == VertexLayout.INTERLEAVED:
-            vertex_data = numpy.ascontiguousarray(
-                _view_array_fields(
-                    particles,
-                    *(attr.name for attr in vertex_format.attributes)),
-                dtype=vertex_format.dtype)
-            gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, size, vertex_data)
-        elif self._vertex_layout == VertexLayout.PACKED:
-            vertex_capacity = int(vbo_capacity / vertex_format.size)
-            offset = 0
-            for attr in vertex_format.attributes:
-                vertex_data = particles[attr.name]
-                gl.glBufferSubData(gl.GL_ARRAY_BUFFER, offset,
-                                   attr.size * particle_count,
-                                   vertex_data)
-                offset += attr.size * vertex_capacity
-
-        gl.glUseProgram(program)
-        gl.glBindVertexArray(vao)
-        gl.glUniformMatrix4fv(uniforms.projection, 1, gl.GL_FALSE, projection)
+        if (self._vertex_layout == VertexLayout.PACKED
+                and self._attribute_capacities[vao] != vbo_capacity):
+            # The vertex attribute offsets need to be recomputed whenever a VBO
+            # with a packed layout is resized. This is only done for the
+            # vertex format being drawn, the other ones being updated if and
+            # when they are drawn next.
+            _set_vertex_attributes(vertex_format, VertexLayout.PACKED,
+                                   vbo_capacity // vertex_format.size)
+            self._attribute_capacities[vao] = vbo_capacity
+            gl_state.vao = vao
+            gl_state.array_buffer = vbo
+
+        if particle_count > 0:
+            self._upload_particles(particles, vertex_format, vbo_capacity)
+
+        gl_state.use_program(program)
+        gl_state.bind_vao(vao)
+        gl_state.set_uniform_matrix(uniforms.projection, projection)
 
         if state.particle_display == ParticleDisplay.POINT:
             gl.glPointSize(state.point_size)
@@ -526,26 +832,55 @@ class Renderer(object):
             # for each particle with their position defined in the vertex
             # shader.
             pixel_size = state.view_aperture.x / state.window_size.x
-            gl.glUniform1f(uniforms.half_edge_feather,
-                           state.edge_feather * 0.5 * pixel_size)
-            gl.glUniform1f(uniforms.half_stroke_width,
-                           state.stroke_width * 0.5 * pixel_size)
-            gl.glUniform1i(uniforms.fill,
-                           state.particle_display == ParticleDisplay.DISC)
+            gl_state.set_uniform(gl.glUniform1f, uniforms.half_edge_feather,
+                                 state.edge_feather * 0.5 * pixel_size)
+            gl_state.set_uniform(gl.glUniform1f, uniforms.half_stroke_width,
+                                 state.stroke_width * 0.5 * pixel_size)
+            gl_state.set_uniform(
+                gl.glUniform1i, uniforms.fill,
+                state.particle_display == ParticleDisplay.DISC)
             if particle_count > 0:
                 gl.glDrawArraysInstanced(gl.GL_TRIANGLE_STRIP, 0, 4,
                                          particle_count)
 
+    def _upload_particles(self, particles, vertex_format, vbo_capacity):
+        """Write the particles into the OpenGL VBO buffer currently bound."""
+        particle_count = len(particles)
+        if self._vertex_layout == VertexLayout.INTERLEAVED:
+            size = vertex_format.stride * particle_count
+        elif self._vertex_layout == VertexLayout.PACKED:
+            size = vbo_capacity
+
+        # Invalidating the whole buffer lets the driver orphan the storage
+        # still in use by any pending draw call instead of waiting for it.
+        address = gl.glMapBufferRange(
+            gl.GL_ARRAY_BUFFER, 0, size,
+            gl.GL_MAP_WRITE_BIT | gl.GL_MAP_INVALIDATE_BUFFER_BIT)
+        if not address:
+            raise RuntimeError("Could not map the particles VBO.")
+
+        try:
+            data = (ctypes.c_ubyte * size).from_address(address)
+            if self._vertex_layout == VertexLayout.INTERLEAVED:
+                vertex_data = numpy.frombuffer(data, dtype=vertex_format.dtype)
+                for attr in vertex_format.attributes:
+                    vertex_data[attr.name] = particles[attr.name].reshape(
+                        particle_count, attr.count)
+            elif self._vertex_layout == VertexLayout.PACKED:
+                vertex_capacity = vbo_capacity // vertex_format.size
+                for attr, offset in zip(vertex_format.attributes,
+                                        vertex_format.offsets):
+                    vertex_data = numpy.frombuffer(
+                        data, dtype=attr.dtype, count=particle_count,
+                        offset=offset * vertex_capacity)
+                    vertex_data[...] = particles[attr.name].reshape(
+                        particle_count, attr.count)
+        finally:
+            gl.glUnmapBuffer(gl.GL_ARRAY_BUFFER)
+
     def _reserve_vbo(self, capacity):
         """Increase the capacity of the OpenGL VBO buffer currently bound."""
         gl.glBufferData(gl.GL_ARRAY_BUFFER, capacity, None, gl.GL_DYNAMIC_DRAW)
-        if self._vertex_layout == VertexLayout.PACKED:
-            # The vertex attribute offsets need to be recomputed whenever a VBO
-            # with a packed layout is resized.
-            for vertex_format in self._vertex_formats:
-                vertex_capacity = int(capacity / vertex_format.size)
-                _set_vertex_attributes(vertex_format, VertexLayout.PACKED,
-                                       vertex_capacity)
 
 
 def get_info():
@@ -561,60 +896,101 @@ def get_info():
 
 def _generate_buffers(bufs_data):
     """Generate the OpenGL buffers."""
-    bufs = {}
+    bufs = []
     for buf_data in bufs_data:
         buf_type = buf_data['type']
         buf_names = buf_data['names']
         if buf_type == 'vao':
             gen_function = gl.glGenVertexArrays
-            struct = collections.namedtuple('_Buffers_vao', buf_names)
-        elif buf_type == 'vbo':
+        else:
             gen_function = gl.glGenBuffers
-            struct = collections.namedtuple('_Buffers_vbo', buf_names)
 
         count = len(buf_names)
         if count == 1:
-            bufs[buf_type] = struct(gen_function(1))
+            values = (gen_function(1),)
         elif count > 1:
-            bufs[buf_type] = struct(*gen_function(count))
+            values = tuple(gen_function(count))
         else:
-            bufs[buf_type] = struct()
+            values = ()
+
+        bufs.append((buf_type, _Group(zip(buf_names, values))))
 
-    struct = collections.namedtuple('_Buffers', bufs.keys())
-    return struct(**bufs)
+    return _Group(bufs)
 
 
 def _create_programs(programs_data):
     """Create the OpenGL programs."""
+    if (_parallel_shader_compile is not None
+            and _parallel_shader_compile.glInitParallelShaderCompileARB()):
+        _parallel_shader_compile.glMaxShaderCompilerThreadsARB(0xFFFFFFFF)
+
+    binary_formats = _get_program_binary_formats()
+    if binary_formats:
+        cache_dir = _get_program_cache_dir()
+    else:
+        cache_dir = None
+
+    # Querying the status of a shader or of a program forces the driver to
+    # wait for its compilation to complete. Checking for errors only after
+    # all the programs have been submitted lets these compile concurrently.
     programs = {}
+    pending = []
     for program_data in programs_data:
+        program_name = program_data['name']
+        shaders_data = program_data['shaders']
+        sources = tuple(
+            (shader_data['type'],
+             _read_shader_source(shader_data['filepath']))
+            for shader_data in shaders_data)
+
         program = gl.glCreateProgram()
+        if cache_dir is None:
+            cache_filepath = None
+        else:
+            cache_filepath = os.path.join(
+                cache_dir, '%s.bin' % (_get_program_cache_key(sources),))
+            if _load_program_binary(program, cache_filepath,
+                                    binary_formats):
+                programs[program_name] = program
+                continue
+
+            gl.glDeleteProgram(program)
+            program = gl.glCreateProgram()
+            gl.glProgramParameteri(program,
+                                   gl.GL_PROGRAM_BINARY_RETRIEVABLE_HINT,
+                                   gl.GL_TRUE)
 
         shaders = []
-        shaders_data = program_data['shaders']
-        for shader_data in shaders_data:
-            shader = _create_shader_from_file(shader_data['filepath'],
-                                              shader_data['type'])
+        for shader_type, source in sources:
+            shader = _create_shader(source, shader_type)
             gl.glAttachShader(program, shader)
             shaders.append(shader)
 
         gl.glLinkProgram(program)
+        pending.append((program_name, program, shaders, cache_filepath))
+
+    for program_name, program, shaders, cache_filepath in pending:
+        for shader in shaders:
+            if gl.glGetShaderiv(shader, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
+                raise RuntimeError(gl.glGetShaderInfoLog(shader).decode())
+
         if gl.glGetProgramiv(program, gl.GL_LINK_STATUS) != gl.GL_TRUE:
             raise RuntimeError(gl.glGetProgramInfoLog(program).decode())
 
         for shader in shaders:
             gl.glDeleteShader(shader)
 
-        program_name = program_data['name']
+        if cache_filepath is not None:
+            _save_program_binary(program, cache_filepath)
+
         programs[program_name] = program
 
-    struct = collections.namedtuple('_Programs', programs.keys())
-    return struct(**programs)
+    return _Group(programs.items())
 
 
 def _get_uniform_locations(uniforms_data, programs):
     """Retrieve the OpenGL uniform locations for the specified programs."""
-    uniforms = {}
+    uniforms = []
     for uniform_data in uniforms_data:
         program_name = uniform_data['program']
         program = getattr(programs, program_name, None)
@@ -624,17 +1000,27 @@ def _get_uniform_locations(uniforms_data, programs):
 
         uniform_names = uniform_data['names']
 
-        program_uniforms = {}
-        for uniform_name in uniform_names:
-            location = gl.glGetUniformLocation(program, uniform_name)
-            program_uniforms[uniform_name] = location
+        program_uniforms = _Group(
+            (uniform_name, gl.glGetUniformLocation(program, uniform_name))
+            for uniform_name in uniform_names)
+        uniforms.append((program_name, program_uniforms))
 
-        struct = collections.namedtuple('_Uniforms_%s' % program_name,
-                                        uniform_names)
-        uniforms[program_name] = struct(**program_uniforms)
+    return _Group(uniforms)
 
-    struct = collections.namedtuple('_Uniforms', uniforms.keys())
-    return struct(**uniforms)
+
+def _bind_uniform_blocks(uniform_blocks_data, programs):
+    """Assign the OpenGL uniform blocks to their binding points."""
+    for uniform_block_data in uniform_blocks_data:
+        program_name = uniform_block_data['program']
+        program = getattr(programs, program_name, None)
+        if program is None:
+            raise RuntimeError("No program with the name '%s' was defined."
+                               % program_name)
+
+        index = gl.glGetUniformBlockIndex(
+            program, uniform_block_data['name'].encode())
+        gl.glUniformBlockBinding(program, index,
+                                 uniform_block_data['binding'])
 
 
 def _get_vertex_formats(vertex_formats_data, bufs):
@@ -645,7 +1031,7 @@ def _get_vertex_formats(vertex_formats_data, bufs):
     def gl_to_numpy_type(gl_type):
         return hienoi._numeric.to_numpy(hienoi._numeric.from_gl(gl_type))
 
-    formats = {}
+    formats = []
     for vertex_format_data in vertex_formats_data:
         vertex_format_name = vertex_format_data['name']
         attrs = tuple(
@@ -656,20 +1042,35 @@ def _get_vertex_formats(vertex_formats_data, bufs):
                 type=attr['type'],
                 size=get_gl_type_size(attr['type']) * attr['count'],
                 normalized=attr['normalized'],
-                divisor=attr.get('divisor', 0))
+                divisor=attr.get('divisor', 0),
+                dtype=numpy.dtype((gl_to_numpy_type(attr['type']),
+                                   (attr['count'],))))
             for attr in vertex_format_data['attributes'])
-        dtype = numpy.dtype([
-            (attr['name'], (gl_to_numpy_type(attr['type']), (attr['count'],)))
-            for attr in vertex_format_data['attributes']])
-        formats[vertex_format_name] = _VertexFormat(
+        offsets = []
+        size = 0
+        for attr in attrs:
+            offsets.append(size)
+            size += attr.size
+
+        # Pad the interleaved vertices to keep every attribute 4-byte aligned.
+        stride = size + (-size % 4)
+        dtype = numpy.dtype({
+            'names': [attr.name for attr in attrs],
+            'formats': [attr.dtype for attr in attrs],
+            'offsets': offsets,
+            'itemsize': stride,
+        })
+
+        formats.append((vertex_format_name, _VertexFormat(
             vao=getattr(bufs.vao, vertex_format_data['vao']),
             vbo=getattr(bufs.vbo, vertex_format_data['vbo']),
             attributes=attrs,
-            size=sum(attr.size for attr in attrs),
-            dtype=dtype)
+            offsets=tuple(offsets),
+            size=size,
+            stride=stride,
+            dtype=dtype)))
 
-    struct = collections.namedtuple('_VertexFormats', formats.keys())
-    return struct(**formats)
+    return _Group(formats)
 
 
 def _set_vertex_attributes(vertex_format, layout, vbo_vertex_capacity):
@@ -677,45 +1078,138 @@ def _set_vertex_attributes(vertex_format, layout, vbo_vertex_capacity):
     gl.glBindVertexArray(vertex_format.vao)
     gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_format.vbo)
 
+    # With a packed layout, the data for each attribute is laid out
+    # contiguously for the whole capacity of the VBO, which scales the offsets
+    # of the interleaved layout by the vertex capacity.
     if layout == VertexLayout.INTERLEAVED:
-        stride = sum(attr.size for attr in vertex_format.attributes)
-        offsets = [0] + list(_accumulate([
-            attr.size for attr in vertex_format.attributes[:-1]]))
+        stride = vertex_format.stride
+        scale = 1
     elif layout == VertexLayout.PACKED:
         stride = 0
-        offsets = [0] + list(_accumulate([
-            attr.size * vbo_vertex_capacity
-            for attr in vertex_format.attributes[:-1]]))
+        scale = vbo_vertex_capacity
 
-    for i, attr in enumerate(vertex_format.attributes):
+    for attr, offset in zip(vertex_format.attributes, vertex_format.offsets):
         gl.glEnableVertexAttribArray(attr.location)
         gl.glVertexAttribPointer(
             attr.location, attr.count, attr.type,
-            attr.normalized, stride, ctypes.c_voidp(offsets[i]))
+            gl.GL_TRUE if attr.normalized else gl.GL_FALSE, stride,
+            ctypes.c_voidp(offset * scale))
         gl.glVertexAttribDivisor(attr.location, attr.divisor)
 
 
-def _create_shader_from_file(filepath, shader_type):
-    """Create an OpenGL shader from a file."""
+def _read_shader_source(filepath):
+    """Read the source of an OpenGL shader from a file."""
     here = os.path.abspath(os.path.dirname(__file__))
     filepath = os.path.abspath(os.path.join(here, filepath))
     with open(filepath, 'r') as shader_file:
-        shader = gl.glCreateShader(shader_type)
-        gl.glShaderSource(shader, shader_file.read())
-        gl.glCompileShader(shader)
-        if gl.glGetShaderiv(shader, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
-            raise RuntimeError(gl.glGetShaderInfoLog(shader).decode())
+        return shader_file.read()
+
+
+def _create_shader(source, shader_type):
+    """Create an OpenGL shader."""
+    shader = gl.glCreateShader(shader_type)
+    gl.glShaderSource(shader, source)
+    gl.glCompileShader(shader)
+    return shader
+
+
+def _get_program_binary_formats():
+    """Retrieve the program binary formats supported by the driver."""
+    if (_get_program_binary is None
+            or not _get_program_binary.glInitGetProgramBinaryARB()):
+        return ()
 
-        return shader
+    count = int(gl.glGetIntegerv(gl.GL_NUM_PROGRAM_BINARY_FORMATS))
+    if count == 0:
+        return ()
 
-    return 0
+    formats = (gl.GLint * count)()
+    gl.glGetIntegerv(gl.GL_PROGRAM_BINARY_FORMATS, formats)
+    return tuple(formats)
+
+
+def _get_program_cache_dir():
+    """Retrieve the directory where the program binaries are cached."""
+    root = os.environ.get('XDG_CACHE_HOME')
+    if not root:
+        root = os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(root, 'hienoi', 'shaders')
+
+
+def _get_program_cache_key(sources):
+    """Retrieve the key identifying a program binary in the cache."""
+    # Program binaries are specific to the driver that produced them.
+    digest = hashlib.sha1()
+    for name in (gl.GL_VENDOR, gl.GL_RENDERER, gl.GL_VERSION):
+        digest.update(gl.glGetString(name))
+
+    for shader_type, source in sources:
+        digest.update(str(int(shader_type)).encode())
+        digest.update(source.encode())
+
+    return digest.hexdigest()
+
+
+def _load_program_binary(program, filepath, binary_formats):
+    """Load a program from a cached binary, if any."""
+    try:
+        with open(filepath, 'rb') as cache_file:
+            data = cache_file.read()
+    except (IOError, OSError):
+        return False
+
+    header_size = struct.calcsize(_PROGRAM_BINARY_HEADER)
+    if len(data) <= header_size:
+        return False
+
+    binary_format, = struct.unpack(_PROGRAM_BINARY_HEADER,
+                                   data[:header_size])
+    if binary_format not in binary_formats:
+        return False
+
+    binary = data[header_size:]
+    gl.glProgramBinary(program, binary_format, binary, len(binary))
+    return gl.glGetProgramiv(program, gl.GL_LINK_STATUS) == gl.GL_TRUE
+
+
+def _save_program_binary(program, filepath):
+    """Save the binary of a program into the cache."""
+    size = int(gl.glGetProgramiv(program, gl.GL_PROGRAM_BINARY_LENGTH))
+    if size == 0:
+        return
+
+    binary = ctypes.create_string_buffer(size)
+    binary_format = gl.GLenum()
+    length = gl.GLsizei()
+    gl.glGetProgramBinary(program, size, ctypes.byref(length),
+                          ctypes.byref(binary_format), binary)
+    data = (struct.pack(_PROGRAM_BINARY_HEADER, binary_format.value)
+            + binary.raw[:length.value])
+
+    # The cache is an optimization, failing to write to it is not an error.
+    # The file is written under a temporary name first to prevent other
+    # processes from reading an incomplete binary.
+    directory = os.path.dirname(filepath)
+    temp_filepath = '%s.%d.tmp' % (filepath, os.getpid())
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(temp_filepath, 'wb') as cache_file:
+            cache_file.write(data)
+
+        os.rename(temp_filepath, filepath)
+    except (IOError, OSError):
+        if os.path.exists(temp_filepath):
+            os.remove(temp_filepath)
 
 
 def _get_projection_matrix(window_size, view_position, view_zoom,
                            view_aperture, initial_view_aperture_x):
     """Retrieve the projection matrix."""
     scale = 2.0 * view_zoom / initial_view_aperture_x
-    return (ctypes.c_float * 16)(
+    return (
         scale,
         0.0,
         0.0,
@@ -746,14 +1240,31 @@ def _get_screen_space_grid_unit(state):
             / (level * state.grid_density))
 
 
-def _grow_capacity(requested, current, grow_factor):
-    """Recommended a new capacity value for when a buffer needs to grow."""
-    return max(requested,
-               int(max(current * grow_factor,
-                       math.ceil(1.0 / (grow_factor - 1.0)) * 2)))
-
-
-def _view_array_fields(array, *fields):
-    """View the fields data from a NumPy array."""
-    return array.getfield(numpy.dtype(
-        {field: array.dtype.fields[field] for field in fields}))
+def _cull_particles(particles, state):
+    """Retrieve the particles overlapping the view, in the same order."""
+    pixel_size = state.view_aperture.x / state.window_size.x
+    position = particles['position']
+    if state.particle_display == ParticleDisplay.POINT:
+        reach = (state.point_size * 0.5 + 1.0) * pixel_size
+    else:
+        # Account for the padding added to the billboards in the shader.
+        reach = particles['size'].astype(numpy.float32)
+        reach += (((state.edge_feather + state.stroke_width) * 0.5 + 1.0)
+                  * pixel_size)
+
+    half_aperture_x = state.view_aperture.x * 0.5
+    half_aperture_y = state.view_aperture.y * 0.5
+    mask = (numpy.abs(position[:, 0] - state.view_position.x)
+            <= reach + half_aperture_x)
+    mask &= (numpy.abs(position[:, 1] - state.view_position.y)
+             <= reach + half_aperture_y)
+    if mask.all():
+        # Nothing is culled, avoid copying the particles.
+        return particles
+
+    return particles[mask]
+
+
+def _to_uint_array(values):
+    """Convert a sequence of OpenGL object names into a ctypes array."""
+    return (gl.GLuint * len(values))(*values)
@@ -1,9 +1,11 @@
 #version 330 core
 
-uniform ivec2 origin;
-uniform float unit;
-uniform vec4 color;
-uniform vec4 origin_color;
+layout(std140) uniform Grid {
+    vec4 color;
+    vec4 origin_color;
+    ivec2 origin;
+    float unit;
+};
 
 layout(location=0) out vec4 out_color;
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import os
+import pickle
 import sys
 import unittest
 
@@ -35,6 +36,48 @@ class DynamicArrayTest(unittest.TestCase):
         self.assertEqual(a.data.tolist(), [0, 1, 4, 9])
         self.assertEqual(len(a.data.base), 256)
 
+    def test_data_cache(self):
+        a = DynamicArray(256, numpy.dtype(numpy.int8))
+        a.extend([0, 1, 4, 9])
+        data = a.data
+        self.assertIs(a.data, data)
+
+        a.append(16)
+        self.assertIsNot(a.data, data)
+        self.assertEqual(a.data.tolist(), [0, 1, 4, 9, 16])
+
+        a.clear()
+        self.assertEqual(a.data.tolist(), [])
+
+    def test_pickle(self):
+        a = DynamicArray(0, numpy.dtype(numpy.int8))
+        a.extend([0, 1, 4, 9])
+        a.data
+        a = pickle.loads(pickle.dumps(a))
+        self.assertEqual(a.data.tolist(), [0, 1, 4, 9])
+
+        a.data[0] = 2
+        a.append(16)
+        self.assertEqual(a.data.tolist(), [2, 1, 4, 9, 16])
+
+    def test_equals(self):
+        a = DynamicArray(256, numpy.dtype(numpy.int8))
+        self.assertTrue(a.equals([]))
+
+        a.extend([0, 1, 4, 9])
+        self.assertTrue(a.equals([0, 1, 4, 9]))
+        self.assertTrue(a.equals(numpy.array([0, 1, 4, 9])))
+        self.assertFalse(a.equals([0, 1, 4]))
+        self.assertFalse(a.equals([0, 1, 4, 8]))
+
+        b = DynamicArray(0, numpy.dtype([
+            ('a', numpy.int8),
+            ('b', numpy.float32),
+        ]))
+        b.extend([(4, 3.5), (7, 1.0)])
+        self.assertTrue(b.equals([(4, 3.5), (7, 1.0)]))
+        self.assertFalse(b.equals([(4, 3.5), (7, 2.0)]))
+
     def test_capacity(self):
         a = DynamicArray(0, numpy.dtype(numpy.float32))
         self.assertEqual(a.capacity, 0)
@@ -66,6 +109,15 @@ class DynamicArrayTest(unittest.TestCase):
         self.assertEqual(len(b), 4)
         self.assertEqual(b.data.tolist(), [(4, 902.345), (7, 548.229), (2, 771.031), (8, 858.063),])
 
+        c = DynamicArray(0, a.dtype)
+        c.copy_from(a.data)
+        self.assertEqual(len(c), 4)
+        self.assertEqual(c.data.tolist(), a.data.tolist())
+
+        d = DynamicArray(0, numpy.dtype(numpy.int8))
+        d.copy_from(numpy.arange(3, dtype=numpy.int8))
+        self.assertEqual(d.data.tolist(), [0, 1, 2])
+
     def test_grow(self):
         a = DynamicArray(0, numpy.dtype(numpy.int8))
         self.assertEqual(len(a), 0)
@@ -94,6 +146,13 @@ class DynamicArrayTest(unittest.TestCase):
         self.assertGreaterEqual(a.capacity, request)
         self.assertEqual(a.data.tolist(), [0, 1, 4, 9])
 
+        data = a.data
+        request = a.capacity * 2
+        a.grow(request)
+        self.assertGreaterEqual(a.capacity, request)
+        self.assertEqual(a.data.tolist(), [0, 1, 4, 9])
+        self.assertEqual(data.tolist(), [0, 1, 4, 9])
+
         request = a.capacity * 2
         a.grow(request, copy=False)
         self.assertEqual(len(a), 0)
@@ -166,6 +225,34 @@ class DynamicArrayTest(unittest.TestCase):
         self.assertEqual(len(a), 12)
         self.assertEqual(a.data.tolist(), [0, 1, 4, 9, 2, 4, 6, 8, 0, 1, 2, 3])
 
+        a.extend(i * 3 for i in range(2))
+        self.assertEqual(len(a), 14)
+        self.assertEqual(a.data.tolist(), [0, 1, 4, 9, 2, 4, 6, 8, 0, 1, 2, 3, 0, 3])
+
+        a.extend(range(5, 7))
+        self.assertEqual(len(a), 16)
+        self.assertEqual(a.data.tolist(),
+                         [0, 1, 4, 9, 2, 4, 6, 8, 0, 1, 2, 3, 0, 3, 5, 6])
+
+        b = DynamicArray(0, numpy.dtype([
+            ('a', numpy.int8),
+            ('b', numpy.float32),
+        ]))
+        b.extend((i, i * 0.5) for i in range(2))
+        self.assertEqual(b.data.tolist(), [(0, 0.0), (1, 0.5)])
+
+    def test_emplace(self):
+        a = DynamicArray(0, numpy.dtype(numpy.int8))
+        a.extend([0, 1])
+
+        data = a.emplace(2)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(len(a), 4)
+        self.assertGreaterEqual(a.capacity, 4)
+
+        data[...] = [4, 9]
+        self.assertEqual(a.data.tolist(), [0, 1, 4, 9])
+
     def test_clear(self):
         a = DynamicArray(0, numpy.dtype(numpy.int8))
         a.extend([0, 1, 4, 9])
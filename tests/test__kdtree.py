@@ -52,7 +52,9 @@ class KDTreeTest(unittest.TestCase):
             },
         ]
 
-        trees = [KDTree(a, bucket_size=size) for size in range(1, len(a) + 1)]
+        trees = [KDTree(a, bucket_size=size, brute_force_threshold=0)
+                 for size in range(1, len(a) + 1)]
+        trees.append(KDTree(a))
         for tree in trees:
             self._test_search_suite(tree, suite)
 
@@ -99,10 +101,46 @@ class KDTreeTest(unittest.TestCase):
             },
         ]
 
-        trees = [KDTree(a, bucket_size=size) for size in range(1, len(a) + 1)]
+        trees = [KDTree(a, bucket_size=size, brute_force_threshold=0)
+                 for size in range(1, len(a) + 1)]
+        trees.append(KDTree(a))
         for tree in trees:
             self._test_search_suite(tree, suite)
 
+    def test_brute_force(self):
+        dtype = numpy.dtype((numpy.float32, 2))
+        a = numpy.array([
+            ( 0.0,  0.0 ),
+            ( 1.0,  0.0 ),
+            ( 0.0, -1.25),
+            ( 2.0,  0.0 ),
+            (-1.5,  1.5 ),
+            ( 0.5,  3.0 ),
+        ], dtype=dtype)
+
+        brute_force_tree = KDTree(a)
+        trees = [KDTree(a, bucket_size=size, brute_force_threshold=0)
+                 for size in range(1, len(a) + 1)]
+
+        # Points lying exactly at the radius are excluded when searching for
+        # the k nearests but included when searching for all the points.
+        point = (0.0, 0.0)
+        for count in (2, 4, len(a)):
+            for radius in (None, 0.5, 1.0, 2.0, 10.0):
+                expected = brute_force_tree.search(point, count, radius, True)
+                for tree in trees:
+                    neighbours = tree.search(point, count, radius, True)
+                    self.assertEqual(
+                        sorted(zip(neighbours['index'].tolist(),
+                                   neighbours['squared_distance'].tolist())),
+                        sorted(zip(expected['index'].tolist(),
+                                   expected['squared_distance'].tolist())))
+
+        neighbours = brute_force_tree.search(point, 4, 1.0, True)
+        self.assertEqual(neighbours['index'].tolist(), [0])
+        neighbours = brute_force_tree.search(point, len(a), 1.0, True)
+        self.assertEqual(neighbours['index'].tolist(), [0, 1])
+
     def _test_search_suite(self, tree, suite):
         for case in suite:
             for search in case['searches']:
@@ -112,7 +150,7 @@ class KDTreeTest(unittest.TestCase):
                 neighbours = tree.search(*args, **kwargs)
                 self.assertEqual(len(neighbours), n)
                 self.assertEqual(neighbours['index'].tolist(), case['expected_indices'][:n])
-                self.assertEqual([round(d, 3) for d in neighbours['squared_distance']], case['expected_squared_distances'][:n])
+                self.assertEqual(numpy.round(neighbours['squared_distance'], 3).tolist(), case['expected_squared_distances'][:n])
 
 
 if __name__ == '__main__':
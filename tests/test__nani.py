@@ -8,7 +8,7 @@ _HERE = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, os.path.abspath(os.path.join(_HERE, os.pardir)))
 
 import hienoi._nani
-from hienoi._numeric import Float32
+from hienoi._numeric import Float16, Float32
 
 
 _PY2 = sys.version_info[0] == 2
@@ -26,6 +26,9 @@ class NaniTest(unittest.TestCase):
         data_type = hienoi._nani.Number(type=Float32, default=1.23)
         self.assertIsNotNone(hienoi._nani.resolve(data_type))
 
+        data_type = hienoi._nani.Number(type=Float16, default=1.23)
+        self.assertIsNotNone(hienoi._nani.resolve(data_type))
+
         if _PY2:
             data_type = hienoi._nani.String(length=8, default='abc')
             self.assertIsNotNone(hienoi._nani.resolve(data_type))
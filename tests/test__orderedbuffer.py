@@ -60,7 +60,8 @@ class OrderedBufferTest(unittest.TestCase):
         bunch = b.extend([9, 1, 4])
         self.assertEqual(bunch.tolist(), [9, 1, 4])
         self.assertEqual(len(bunch), 3)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertEqual(len(bunch.base) % 3, 0)
+        slab = bunch.base
         self.assertEqual(len(b), 3)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4]])
 
@@ -68,7 +69,8 @@ class OrderedBufferTest(unittest.TestCase):
         bunch = b.extend([0, 7])
         self.assertEqual(bunch.tolist(), [0, 7])
         self.assertEqual(len(bunch), 2)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertEqual(len(bunch.base) % 3, 0)
+        slab = bunch.base
         self.assertEqual(len(b), 5)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7]])
 
@@ -83,14 +85,15 @@ class OrderedBufferTest(unittest.TestCase):
         # Finish filling the second bucket while preserving the order.
         bunch = b.extend([3])
         self.assertEqual(len(bunch), 1)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertIs(bunch.base, slab)
         self.assertEqual(len(b), 8)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7], [5, 2], [3]])
 
         # Partly fill a third bucket.
         bunch = b.extend([6])
         self.assertEqual(len(bunch), 1)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertEqual(len(bunch.base) % 3, 0)
+        slab = bunch.base
         self.assertEqual(len(b), 9)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7], [5, 2], [3], [6]])
 
@@ -104,24 +107,96 @@ class OrderedBufferTest(unittest.TestCase):
         # Finish filling the third bucket.
         bunch = b.extend([7, 8])
         self.assertEqual(len(bunch), 2)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertIs(bunch.base, slab)
         self.assertEqual(len(b), 16)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7], [5, 2], [3], [6], [1, 2, 3, 4, 5], [7, 8]])
 
         # Partly fill a fourth bucket.
         bunch = b.extend([9])
         self.assertEqual(len(bunch), 1)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertEqual(len(bunch.base) % 3, 0)
+        slab = bunch.base
         self.assertEqual(len(b), 17)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7], [5, 2], [3], [6], [1, 2, 3, 4, 5], [7, 8], [9]])
 
         # Finish filling the fourth bucket.
         bunch = b.extend([8, 7])
         self.assertEqual(len(bunch), 2)
-        self.assertEqual(len(bunch.base), 3)
+        self.assertIs(bunch.base, slab)
         self.assertEqual(len(b), 19)
         self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1, 4], [0, 7], [5, 2], [3], [6], [1, 2, 3, 4, 5], [7, 8], [9, 8, 7]])
 
+    def test_slabs(self):
+        b = OrderedBuffer(1, numpy.dtype(numpy.int8))
+
+        # Each new slab holds half as many buckets as already allocated.
+        slabs = []
+        for i in range(13):
+            bunch = b.extend([i])
+            if not slabs or bunch.base is not slabs[-1]:
+                slabs.append(bunch.base)
+
+        self.assertEqual([len(slab) for slab in slabs], [1, 1, 1, 1, 2, 3, 4])
+
+    def test_emplace(self):
+        b = OrderedBuffer(3, numpy.dtype(numpy.int8))
+
+        bunch = b.emplace(0)
+        self.assertEqual(len(bunch), 0)
+        self.assertEqual(len(b), 0)
+
+        bunch = b.emplace(2)
+        bunch[...] = [9, 1]
+        self.assertEqual(len(bunch.base) % 3, 0)
+        slab = bunch.base
+        self.assertEqual(len(b), 2)
+        self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1]])
+
+        bunch = b.emplace(5)
+        bunch[...] = [1, 2, 3, 4, 5]
+        self.assertIsNone(bunch.base)
+        self.assertEqual(len(b), 7)
+        self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1], [1, 2, 3, 4, 5]])
+
+        bunch = b.emplace(1)
+        bunch[...] = [4]
+        self.assertIs(bunch.base, slab)
+        self.assertEqual(len(b), 8)
+        self.assertEqual([chunk.tolist() for chunk in b.chunks], [[9, 1], [1, 2, 3, 4, 5], [4]])
+
+    def test_emplace_reuse(self):
+        b = OrderedBuffer(3, numpy.dtype(numpy.int8))
+        bunch = b.emplace(5)
+        self.assertIsNone(bunch.base)
+
+        b.clear()
+        self.assertIs(b.emplace(5), bunch)
+        self.assertIsNot(b.emplace(5), bunch)
+        self.assertEqual(len(b), 10)
+
+        data = numpy.arange(5, dtype=numpy.int8)
+        b.clear()
+        self.assertIs(b.extend(data), data)
+        b.clear()
+        self.assertIsNot(b.emplace(5), data)
+
+    def test_concatenate(self):
+        b = OrderedBuffer(3, numpy.dtype(numpy.int8))
+        data = b.concatenate()
+        self.assertEqual(data.tolist(), [])
+        self.assertEqual(data.dtype, numpy.int8)
+
+        b.extend([9, 1])
+        b.extend([1, 2, 3, 4, 5])
+        b.append(4)
+        data = b.concatenate()
+        self.assertEqual(data.tolist(), [9, 1, 1, 2, 3, 4, 5, 4])
+
+        out = numpy.zeros(8, dtype=numpy.int8)
+        data = b.concatenate(out=out)
+        self.assertIs(data, out)
+        self.assertEqual(out.tolist(), [9, 1, 1, 2, 3, 4, 5, 4])
+
     def test_clear(self):
         b = OrderedBuffer(3, numpy.dtype(numpy.int8))
         b.extend([9, 1])
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 
+import math
 import os
+import pickle
 import sys
 import unittest
 
+import numpy
+
 _HERE = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, os.path.abspath(os.path.join(_HERE, os.pardir)))
 
@@ -89,6 +93,10 @@ class ParticleSimulationTest(unittest.TestCase):
         self.assertEqual(len(list(iter(sim.particles))), 0)
         self.assertEqual(sim.last_particle_id, 6)
 
+        bunch = sim.add_particles(0)
+        self.assertEqual(len(bunch), 0)
+        self.assertEqual(sim.last_particle_id, 6)
+
         sim.consolidate()
         self.assertEqual(len(sim.particles), 7)
         self.assertEqual(len(list(iter(sim.particles))), 7)
@@ -168,6 +176,75 @@ class ParticleSimulationTest(unittest.TestCase):
         self.assertEqual(p1.position, (1.0, 0.0))
         self.assertEqual(p2.position, (0.0, 0.0))
 
+    def test_step_without_forces(self):
+        for always_integrate in (False, True):
+            sim = hienoi.dynamics.ParticleSimulation(
+                time_step=0.5, always_integrate=always_integrate)
+            sim.add_particle(velocity=(1.0, 0.0))
+            sim.add_particle(velocity=(0.0, 2.0))
+            sim.consolidate()
+            p0 = sim.get_particle(0)
+            p1 = sim.get_particle(1)
+
+            sim.step()
+            self.assertEqual(p0.velocity, (1.0, 0.0))
+            self.assertEqual(p1.velocity, (0.0, 2.0))
+            self.assertEqual(p0.position, (0.5, 0.0))
+            self.assertEqual(p1.position, (0.0, 1.0))
+
+    def test_step_without_forces_shortcut(self):
+        # A massless particle with a negative zero force tells whether the
+        # integration ran: it turns the velocity into NaN and resets the force
+        # to a positive zero, while skipping it leaves both untouched.
+        sim = hienoi.dynamics.ParticleSimulation(time_step=0.5)
+        sim.add_particle(velocity=(1.0, 0.0), force=(-0.0, -0.0), mass=0.0)
+        sim.consolidate()
+        p0 = sim.get_particle(0)
+
+        sim.step()
+        self.assertEqual(p0.velocity, (1.0, 0.0))
+        self.assertEqual(p0.position, (0.5, 0.0))
+        self.assertEqual([math.copysign(1.0, x) for x in p0.force],
+                         [-1.0, -1.0])
+
+        sim = hienoi.dynamics.ParticleSimulation(time_step=0.5,
+                                                 always_integrate=True)
+        sim.add_particle(velocity=(1.0, 0.0), force=(-0.0, -0.0), mass=0.0)
+        sim.consolidate()
+        p0 = sim.get_particle(0)
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            sim.step()
+
+        self.assertTrue(all(math.isnan(x) for x in p0.velocity))
+        self.assertEqual([math.copysign(1.0, x) for x in p0.force],
+                         [1.0, 1.0])
+
+    def test_time_step(self):
+        sim = hienoi.dynamics.ParticleSimulation(time_step=0.5)
+        sim.add_particle(velocity=(1.0, 0.0))
+        sim.consolidate()
+        p0 = sim.get_particle(0)
+
+        sim.step()
+        self.assertEqual(sim.time, 0.5)
+        self.assertEqual(p0.position, (0.5, 0.0))
+
+        sim.time_step = 0.25
+        sim.step()
+        self.assertEqual(sim.time_step, 0.25)
+        self.assertEqual(sim.time, 0.75)
+        self.assertEqual(p0.position, (0.75, 0.0))
+
+    def test_pickle(self):
+        sim = hienoi.dynamics.ParticleSimulation(time_step=0.5)
+        sim.add_particle(velocity=(1.0, 0.0))
+        sim.consolidate()
+
+        sim = pickle.loads(pickle.dumps(sim))
+        sim.step()
+        self.assertEqual(sim.get_particle(0).position, (0.5, 0.0))
+
     def test_consolidate(self):
         sim = hienoi.dynamics.ParticleSimulation()
 
@@ -188,6 +265,26 @@ class ParticleSimulationTest(unittest.TestCase):
         self.assertEqual(len(sim.particles), 3)
         self.assertEqual([particle.id for particle in sim.particles], [0, 2, 3])
 
+    def test_get_neighbour_particles(self):
+        sim = hienoi.dynamics.ParticleSimulation()
+        sim.add_particle(position=(0.0, 0.0))
+        sim.add_particle(position=(1.0, 0.0))
+        sim.add_particle(position=(3.0, 0.0))
+        sim.consolidate()
+
+        neighbours = sim.get_neighbour_particles((0.5, 0.0), count=3,
+                                                 sort=True)
+        self.assertEqual(len(neighbours), 3)
+        self.assertEqual(neighbours.indices.tolist(), [0, 1, 2])
+        self.assertEqual(neighbours.squared_distances.tolist(),
+                         [0.25, 0.25, 6.25])
+        self.assertEqual(
+            [neighbour.particle.id for neighbour in neighbours],
+            [0, 1, 2])
+        self.assertEqual(
+            [neighbour.squared_distance for neighbour in neighbours],
+            [0.25, 0.25, 6.25])
+
 
 if __name__ == '__main__':
     from tests.run import run
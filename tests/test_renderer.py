@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import unittest
+
+import numpy
+
+_HERE = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(_HERE, os.pardir)))
+
+import hienoi.renderer
+from hienoi import ParticleDisplay, Vector2f, Vector2i
+from hienoi._common import PARTICLE_NANI
+
+
+class RendererTest(unittest.TestCase):
+
+    def test_cull_particles(self):
+        state = hienoi.renderer.State(
+            window_size=Vector2i(100, 100),
+            view_position=Vector2f(0.0, 0.0),
+            view_aperture=Vector2f(10.0, 10.0),
+            particle_display=ParticleDisplay.DISC,
+            edge_feather=0.0,
+            stroke_width=0.0)
+
+        particles = numpy.zeros(3, dtype=PARTICLE_NANI.dtype)
+        particles['position'] = [(0.0, 0.0), (4.0, -4.0), (-2.0, 3.0)]
+        particles['size'] = 0.5
+        culled = hienoi.renderer._cull_particles(particles, state)
+        self.assertIs(culled, particles)
+
+        particles['position'][1] = (20.0, 0.0)
+        culled = hienoi.renderer._cull_particles(particles, state)
+        self.assertIsNot(culled, particles)
+        self.assertEqual(culled['position'].tolist(), [[0.0, 0.0], [-2.0, 3.0]])
+
+        state.particle_display = ParticleDisplay.POINT
+        state.point_size = 4
+        particles['position'][1] = (5.0, 0.0)
+        culled = hienoi.renderer._cull_particles(particles, state)
+        self.assertIs(culled, particles)
+
+        particles['position'][1] = (5.5, 0.0)
+        culled = hienoi.renderer._cull_particles(particles, state)
+        self.assertEqual(culled['position'].tolist(), [[0.0, 0.0], [-2.0, 3.0]])
+
+
+if __name__ == '__main__':
+    from tests.run import run
+    run('__main__')